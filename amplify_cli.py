@@ -7,69 +7,140 @@ Allows command-line interaction with the MCP server tools
 import asyncio
 import argparse
 import json
+import os
 import sys
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from datetime import datetime, timedelta
 from pathlib import Path
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 # Add the current directory to Python path
 sys.path.insert(0, str(Path(__file__).parent))
 
-from amplify_docs_server import AmplifyDocsScraper, AmplifyDocsDatabase, init_database
+# amplify_docs_server (aiohttp, bs4, mcp, sqlite setup) is imported inside the
+# commands that need it so --help and the update check stay cheap
 
 LAST_UPDATED_FILE = Path(__file__).parent / "last_updated.json"
+SECONDS_PER_DAY = 24 * 60 * 60
+# The update file is rewritten on every fetch and prompt, so a file younger than
+# this means no prompt is due and the JSON does not need to be parsed
+UPDATE_CHECK_SKIP_SECONDS = 29 * SECONDS_PER_DAY
+# Commands that run without the documentation update check
+SKIP_UPDATE_CHECK_COMMANDS = {'fetch', 'categories', 'stats'}
+# Worker threads used when writing exported markdown files
+EXPORT_WORKERS = 16
+NPM_REGISTRY_URL = "https://registry.npmjs.org"
+# Latest npm versions change over days, so check-versions reuses them for a while
+VERSION_CACHE_FILE = Path(__file__).parent / "version_cache.json"
+VERSION_CACHE_TTL = timedelta(hours=6)
+# Deletes everything but digits and dots from a version range like "^14.2.1"
+_VERSION_CLEAN_TABLE = str.maketrans('', '', ''.join(chr(c) for c in range(256) if chr(c) not in '0123456789.'))
+
+def _read_json(path):
+    """Read a JSON file, using orjson when it is installed."""
+    if orjson is not None:
+        with open(path, 'rb') as f:
+            return orjson.loads(f.read())
+    with open(path, 'r') as f:
+        return json.load(f)
+
+def _write_json(path, data):
+    """Atomically write a JSON file with 2-space indentation, using orjson when it is installed."""
+    # Write to a sibling temp file and swap it in so an interrupted write
+    # can never leave a truncated file behind
+    tmp_path = path.with_name(path.name + '.tmp')
+    if orjson is not None:
+        with open(tmp_path, 'wb') as f:
+            f.write(orjson.dumps(data, option=orjson.OPT_INDENT_2))
+    else:
+        with open(tmp_path, 'w') as f:
+            json.dump(data, f, indent=2)
+    os.replace(tmp_path, path)
+
+def write_lines(lines):
+    """Print lines with a single write instead of one print() call per line."""
+    sys.stdout.write("\n".join(lines) + "\n")
+
+def get_db():
+    """Return the process-wide AmplifyDocsDatabase, creating it on first use."""
+    # Imported here so commands that never touch the database skip the server module
+    from amplify_docs_server import get_db as get_server_db
+    return get_server_db()
 
 def get_last_update_info():
-    """Get last update information from file."""
-    if not LAST_UPDATED_FILE.exists():
-        return None
-    
+    """Get last update information from file, or None if missing or corrupt."""
     try:
-        with open(LAST_UPDATED_FILE, 'r') as f:
-            return json.load(f)
-    except:
+        info = _read_json(LAST_UPDATED_FILE)
+    except (OSError, ValueError):
         return None
+    return info if isinstance(info, dict) else None
+
+def _as_timestamp(value, default):
+    """Convert a stored time (epoch seconds, or an ISO string from older files) to epoch seconds."""
+    if isinstance(value, (int, float)):
+        return float(value)
+    if isinstance(value, str):
+        try:
+            return datetime.fromisoformat(value).timestamp()
+        except ValueError:
+            pass
+    return default
 
 def save_last_update_info(updated=True):
     """Save last update information to file."""
+    # Times are stored as epoch seconds so the update check compares numbers
+    # instead of parsing ISO strings
+    now = time.time()
     info = {
-        "last_updated": datetime.now().isoformat() if updated else None,
-        "last_prompted": datetime.now().isoformat(),
+        "last_updated": now if updated else None,
+        "last_prompted": now,
         "user_declined": not updated
     }
     
-    with open(LAST_UPDATED_FILE, 'w') as f:
-        json.dump(info, f, indent=2)
+    _write_json(LAST_UPDATED_FILE, info)
 
 async def check_and_prompt_for_update():
     """Check if documentation needs updating and prompt user."""
+    # Read the clock once and reuse it for every comparison below
+    now = time.time()
+    try:
+        file_age = now - LAST_UPDATED_FILE.stat().st_mtime
+    except FileNotFoundError:
+        # First time running - create the file
+        save_last_update_info(updated=True)
+        return False
+    
+    if file_age < UPDATE_CHECK_SKIP_SECONDS:
+        return False
+    
     info = get_last_update_info()
     
-    # First time running - create the file
+    # Corrupt file - rewrite it so later runs take the fast path again
     if not info:
         save_last_update_info(updated=True)
         return False
     
     # Check if we should prompt
-    now = datetime.now()
-    
-    # Parse dates
-    last_updated = datetime.fromisoformat(info.get("last_updated", now.isoformat())) if info.get("last_updated") else now
-    last_prompted = datetime.fromisoformat(info.get("last_prompted", "2000-01-01T00:00:00"))
+    last_updated = _as_timestamp(info.get("last_updated"), now)
+    last_prompted = _as_timestamp(info.get("last_prompted"), 0.0)
     
     # Check if it's been more than a month since last update
-    one_month_ago = now - timedelta(days=30)
-    if last_updated > one_month_ago:
+    if last_updated > now - 30 * SECONDS_PER_DAY:
         return False
     
     # Check if user declined and it's been less than a day
     if info.get("user_declined", False):
-        one_day_ago = now - timedelta(days=1)
-        if last_prompted > one_day_ago:
+        if last_prompted > now - SECONDS_PER_DAY:
             return False
     
     # Prompt user
     print("\n📚 Documentation Update Available")
-    print(f"Your documentation was last updated {(now - last_updated).days} days ago.")
+    print(f"Your documentation was last updated {int((now - last_updated) // SECONDS_PER_DAY)} days ago.")
     response = input("Would you like to update the documentation now? (y/n): ").strip().lower()
     
     if response == 'y':
@@ -82,11 +153,16 @@ async def check_and_prompt_for_update():
         save_last_update_info(updated=False)
         return False
 
-async def fetch_docs(force_refresh=False, save_markdown=False):
+async def fetch_docs(force_refresh=False, save_markdown=False, resume=False):
     """Fetch all documentation"""
+    from amplify_docs_server import AmplifyDocsScraper, init_database, close_session
+    
     init_database()
-    async with AmplifyDocsScraper() as scraper:
-        await scraper.scrape_docs(force_refresh=force_refresh, save_markdown=save_markdown)
+    try:
+        async with AmplifyDocsScraper() as scraper:
+            await scraper.scrape_docs(force_refresh=force_refresh, save_markdown=save_markdown, resume=resume)
+    finally:
+        await close_session()
     
     # Update the last_updated file
     save_last_update_info(updated=True)
@@ -97,67 +173,81 @@ async def fetch_docs(force_refresh=False, save_markdown=False):
 
 async def search_docs(query, category=None, limit=10):
     """Search documentation"""
-    db = AmplifyDocsDatabase()
+    db = get_db()
     results = db.search_documents(query, category, limit)
     
     if not results:
         print("No results found")
         return
     
+    lines = []
     for doc in results:
-        print(f"\n📄 {doc['title']}")
-        print(f"   URL: {doc['url']}")
-        print(f"   Category: {doc['category']}")
-        print(f"   Preview: {doc['content'][:200]}...")
+        lines.append(f"\n📄 {doc['title']}")
+        lines.append(f"   URL: {doc['url']}")
+        lines.append(f"   Category: {doc['category']}")
+        lines.append(f"   Preview: {doc['content'][:200]}...")
+    write_lines(lines)
 
 async def list_categories():
     """List all categories"""
-    db = AmplifyDocsDatabase()
+    db = get_db()
     categories = db.list_categories()
-    print("Categories:")
-    for cat in categories:
-        print(f"  - {cat}")
+    write_lines(["Categories:"] + [f"  - {cat}" for cat in categories])
 
 async def get_stats():
     """Get database statistics"""
-    db = AmplifyDocsDatabase()
+    db = get_db()
     stats = db.get_stats()
     
     if not stats:
         print("No statistics available")
         return
         
-    print(f"Total documents: {stats.get('total_documents', 0)}")
+    lines = [f"Total documents: {stats.get('total_documents', 0)}"]
     
     categories = stats.get('categories', {})
     if categories:
-        print(f"Categories: {len(categories)}")
+        lines.append(f"Categories: {len(categories)}")
         for cat, count in categories.items():
-            print(f"  - {cat}: {count} docs")
+            lines.append(f"  - {cat}: {count} docs")
     
     if stats.get('last_update'):
-        print(f"Last update: {stats['last_update']}")
+        lines.append(f"Last update: {stats['last_update']}")
+    write_lines(lines)
 
 async def get_document(url):
     """Get full document content by URL"""
-    db = AmplifyDocsDatabase()
+    db = get_db()
     doc = db.get_document_by_url(url)
     
     if not doc:
         print(f"Document not found: {url}")
         return
     
-    print(f"\n{'='*80}")
-    print(f"📄 {doc['title']}")
-    print(f"URL: {doc['url']}")
-    print(f"Category: {doc['category']}")
-    print(f"Last Updated: {doc['last_scraped']}")
-    print(f"{'='*80}\n")
-    print(doc['markdown_content'])
+    header = (
+        f"\n{'='*80}\n"
+        f"📄 {doc['title']}\n"
+        f"URL: {doc['url']}\n"
+        f"Category: {doc['category']}\n"
+        f"Last Updated: {doc['last_scraped']}\n"
+        f"{'='*80}\n\n"
+    )
+    body = f"{doc['markdown_content']}\n"
+    
+    # Documents can be large, so write encoded bytes straight to the binary
+    # buffer instead of going through print() and the text layer
+    stdout_buffer = getattr(sys.stdout, 'buffer', None)
+    if stdout_buffer is None:
+        sys.stdout.write(header + body)
+        return
+    sys.stdout.flush()
+    stdout_buffer.write(header.encode('utf-8'))
+    stdout_buffer.write(body.encode('utf-8'))
+    stdout_buffer.flush()
 
 async def find_patterns(pattern_type):
     """Find code patterns"""
-    db = AmplifyDocsDatabase()
+    db = get_db()
     # For now, just search for pattern keywords
     results = db.search_documents(pattern_type, limit=20)
     
@@ -165,15 +255,18 @@ async def find_patterns(pattern_type):
         print(f"No {pattern_type} patterns found")
         return
     
-    print(f"\n{pattern_type.upper()} Patterns Found:")
+    lines = [f"\n{pattern_type.upper()} Patterns Found:"]
     for doc in results:
-        print(f"\n📄 {doc['title']}")
-        print(f"   URL: {doc['url']}")
-        print(f"   Preview: {doc['content'][:300]}...")
+        lines.append(f"\n📄 {doc['title']}")
+        lines.append(f"   URL: {doc['url']}")
+        lines.append(f"   Preview: {doc['content'][:300]}...")
+    write_lines(lines)
 
 async def export_markdown():
     """Export all documents to markdown files"""
-    db = AmplifyDocsDatabase()
+    from amplify_docs_server import AmplifyDocsScraper
+    
+    db = get_db()
     scraper = AmplifyDocsScraper()
     output_dir = Path("amplify_docs_markdown")
     output_dir.mkdir(exist_ok=True)
@@ -186,45 +279,106 @@ async def export_markdown():
         return
     
     print(f"Exporting {len(all_docs)} documents to markdown...")
-    exported_count = 0
-    
-    for doc in all_docs:
-        doc_data = {
-            'url': doc['url'],
-            'title': doc['title'],
-            'category': doc['category'],
-            'markdown_content': doc['markdown_content'],
-            'last_scraped': doc['last_scraped']
-        }
-        if scraper.save_markdown_file(doc_data, output_dir):
-            exported_count += 1
+    
+    # Each file write is I/O bound, so overlap them in a thread pool
+    with ThreadPoolExecutor(max_workers=EXPORT_WORKERS) as executor:
+        # save_markdown_file only reads keys, so each document row is passed as is
+        futures = [executor.submit(scraper.save_markdown_file, doc, output_dir) for doc in all_docs]
+        exported_count = sum(1 for future in as_completed(futures) if future.result())
+    
+    # Count files per category directory in a single scandir pass; DirEntry
+    # caches the file type, so no per-file stat() is needed
+    category_counts = {}
+    with os.scandir(output_dir) as entries:
+        for entry in entries:
+            if not entry.is_dir():
+                continue
+            with os.scandir(entry.path) as files:
+                category_counts[entry.name] = sum(1 for f in files if f.name.endswith('.md') and f.is_file())
     
     print(f"✓ Exported {exported_count} documents to: {output_dir}/")
     print(f"📁 Documents organized by category:")
-    for category_dir in sorted(output_dir.iterdir()):
-        if category_dir.is_dir():
-            file_count = len(list(category_dir.glob("*.md")))
-            print(f"   - {category_dir.name}: {file_count} files")
+    for category, file_count in sorted(category_counts.items()):
+        print(f"   - {category}: {file_count} files")
+
+async def fetch_npm_version(session, package):
+    """Get the latest published version of an npm package, or None on failure"""
+    import aiohttp
+    
+    try:
+        async with session.get(f"{NPM_REGISTRY_URL}/{package}/latest") as response:
+            if response.status != 200:
+                return None
+            body = await response.read()
+    except (aiohttp.ClientError, asyncio.TimeoutError):
+        return None
+    
+    try:
+        data = orjson.loads(body) if orjson is not None else json.loads(body)
+    except ValueError:
+        return None
+    # A proxy or captive portal can answer 200 with JSON that isn't the package document
+    version = data.get('version') if isinstance(data, dict) else None
+    return version if isinstance(version, str) else None
+
+def load_version_cache():
+    """Load cached npm versions, keyed by package name."""
+    try:
+        cache = _read_json(VERSION_CACHE_FILE)
+    except (OSError, ValueError):
+        return {}
+    return cache if isinstance(cache, dict) else {}
+
+def get_fresh_cached_version(cache, package, now):
+    """Get a cached version if it was fetched within VERSION_CACHE_TTL."""
+    entry = cache.get(package)
+    try:
+        if now - datetime.fromisoformat(entry['fetched_at']) < VERSION_CACHE_TTL:
+            return entry['version']
+    except (KeyError, TypeError, ValueError):
+        pass
+    return None
+
+async def get_latest_npm_versions(packages):
+    """Get the latest npm versions, hitting the registry only for stale cache entries."""
+    import aiohttp
+    
+    now = datetime.now()
+    cache = load_version_cache()
+    versions = {package: get_fresh_cached_version(cache, package, now) for package in packages}
+    missing = [package for package, version in versions.items() if not version]
+    if not missing:
+        return versions
+    
+    # Query the npm registry for the missing packages concurrently over one session
+    async with aiohttp.ClientSession(timeout=aiohttp.ClientTimeout(total=10)) as session:
+        fetched = await asyncio.gather(*(fetch_npm_version(session, package) for package in missing))
+    
+    fetched_at = now.isoformat()
+    for package, version in zip(missing, fetched):
+        if isinstance(version, str) and version:
+            versions[package] = version
+            cache[package] = {"version": version, "fetched_at": fetched_at}
+    
+    try:
+        _write_json(VERSION_CACHE_FILE, cache)
+    except OSError as e:
+        print(f"⚠️  Could not save version cache: {e}")
+    return versions
 
 async def check_versions():
     """Check Amplify and Next.js version compatibility"""
-    import subprocess
-    import re
-    
     print("🔍 Checking Amplify Gen 2 and Next.js compatibility...\n")
     
-    # Get latest Amplify backend version from npm
-    try:
-        result = subprocess.run(
-            ["npm", "view", "@aws-amplify/backend", "version"],
-            capture_output=True,
-            text=True,
-            check=True
-        )
-        amplify_version = result.stdout.strip()
+    versions = await get_latest_npm_versions(["@aws-amplify/backend", "next"])
+    amplify_version = versions["@aws-amplify/backend"]
+    latest_nextjs = versions["next"]
+    
+    # Get latest Amplify backend version from the npm registry
+    if amplify_version:
         print(f"📦 Latest Amplify Backend version: {amplify_version}")
-    except:
-        print("❌ Could not fetch Amplify version from npm")
+    else:
+        print("❌ Could not fetch Amplify version from the npm registry")
         amplify_version = "Unknown"
     
     # Check local project for Next.js version if package.json exists
@@ -233,27 +387,21 @@ async def check_versions():
     
     if package_json_path.exists():
         try:
-            with open(package_json_path, 'r') as f:
-                package_data = json.load(f)
-                deps = {**package_data.get('dependencies', {}), **package_data.get('devDependencies', {})}
-                if 'next' in deps:
-                    local_nextjs_version = deps['next']
-                    print(f"📦 Local Next.js version: {local_nextjs_version}")
-        except:
+            package_data = _read_json(package_json_path)
+            # Look the key up directly; devDependencies wins as it did when the dicts were merged
+            deps = package_data.get('dependencies') or {}
+            dev_deps = package_data.get('devDependencies') or {}
+            local_nextjs_version = dev_deps.get('next') or deps.get('next')
+            if local_nextjs_version:
+                print(f"📦 Local Next.js version: {local_nextjs_version}")
+        except (OSError, ValueError, AttributeError):
             pass
     
     # Get latest Next.js version
-    try:
-        result = subprocess.run(
-            ["npm", "view", "next", "version"],
-            capture_output=True,
-            text=True,
-            check=True
-        )
-        latest_nextjs = result.stdout.strip()
+    if latest_nextjs:
         print(f"📦 Latest Next.js version: {latest_nextjs}")
-    except:
-        print("❌ Could not fetch Next.js version from npm")
+    else:
+        print("❌ Could not fetch Next.js version from the npm registry")
         latest_nextjs = "Unknown"
     
     print("\n✅ Compatibility Information:")
@@ -270,7 +418,7 @@ async def check_versions():
     
     if local_nextjs_version:
         # Clean version string (remove ^, ~, etc.)
-        clean_version = re.sub(r'[^\d.]', '', local_nextjs_version)
+        clean_version = local_nextjs_version.translate(_VERSION_CLEAN_TABLE)
         if clean_version:
             major = int(clean_version.split('.')[0])
             if major >= 14:
@@ -290,6 +438,16 @@ async def check_versions():
     print("  npx create-amplify@latest")
     print("  npm install aws-amplify@latest")
 
+async def run_command(args):
+    """Run the update check (when needed) and the selected command"""
+    # Check for updates before commands that read doc content (fetch updates
+    # itself, and categories/stats are quick metadata reads)
+    if args.command not in SKIP_UPDATE_CHECK_COMMANDS:
+        await check_and_prompt_for_update()
+    
+    # Each subparser sets func to a coroutine factory for its command
+    await args.func(args)
+
 def main():
     parser = argparse.ArgumentParser(description='AWS Amplify Docs CLI')
     subparsers = parser.add_subparsers(dest='command', help='Commands')
@@ -298,32 +456,41 @@ def main():
     fetch_parser = subparsers.add_parser('fetch', help='Fetch all documentation')
     fetch_parser.add_argument('--force', action='store_true', help='Force refresh')
     fetch_parser.add_argument('--save-markdown', action='store_true', help='Save documents as markdown files')
+    fetch_parser.add_argument('--resume', action='store_true', help='Continue an interrupted fetch, skipping pages saved in the last 7 days')
+    fetch_parser.set_defaults(func=lambda a: fetch_docs(a.force, a.save_markdown, a.resume))
     
     # Search command
     search_parser = subparsers.add_parser('search', help='Search docs')
     search_parser.add_argument('query', help='Search query')
     search_parser.add_argument('--category', help='Filter by category')
     search_parser.add_argument('--limit', type=int, default=10, help='Max results')
+    search_parser.set_defaults(func=lambda a: search_docs(a.query, a.category, a.limit))
     
     # Categories command
-    subparsers.add_parser('categories', help='List categories')
+    categories_parser = subparsers.add_parser('categories', help='List categories')
+    categories_parser.set_defaults(func=lambda a: list_categories())
     
     # Stats command
-    subparsers.add_parser('stats', help='Show statistics')
+    stats_parser = subparsers.add_parser('stats', help='Show statistics')
+    stats_parser.set_defaults(func=lambda a: get_stats())
     
     # Get document command
     get_doc_parser = subparsers.add_parser('get-document', help='Get full document content')
     get_doc_parser.add_argument('url', help='Document URL')
+    get_doc_parser.set_defaults(func=lambda a: get_document(a.url))
     
     # Patterns command
     patterns_parser = subparsers.add_parser('patterns', help='Find patterns')
     patterns_parser.add_argument('type', choices=['auth', 'api', 'storage', 'deployment', 'configuration', 'database', 'functions'])
+    patterns_parser.set_defaults(func=lambda a: find_patterns(a.type))
     
     # Export markdown command
-    subparsers.add_parser('export-markdown', help='Export all documents to markdown files')
+    export_parser = subparsers.add_parser('export-markdown', help='Export all documents to markdown files')
+    export_parser.set_defaults(func=lambda a: export_markdown())
     
     # Check versions command
-    subparsers.add_parser('check-versions', help='Check Amplify and Next.js version compatibility')
+    versions_parser = subparsers.add_parser('check-versions', help='Check Amplify and Next.js version compatibility')
+    versions_parser.set_defaults(func=lambda a: check_versions())
     
     args = parser.parse_args()
     
@@ -331,27 +498,8 @@ def main():
         parser.print_help()
         return
     
-    # Check for updates before running commands (except for fetch itself)
-    if args.command != 'fetch':
-        asyncio.run(check_and_prompt_for_update())
-    
-    # Run the appropriate command
-    if args.command == 'fetch':
-        asyncio.run(fetch_docs(args.force, args.save_markdown))
-    elif args.command == 'search':
-        asyncio.run(search_docs(args.query, args.category, args.limit))
-    elif args.command == 'categories':
-        asyncio.run(list_categories())
-    elif args.command == 'stats':
-        asyncio.run(get_stats())
-    elif args.command == 'get-document':
-        asyncio.run(get_document(args.url))
-    elif args.command == 'patterns':
-        asyncio.run(find_patterns(args.type))
-    elif args.command == 'export-markdown':
-        asyncio.run(export_markdown())
-    elif args.command == 'check-versions':
-        asyncio.run(check_versions())
+    # Run the update check and the command on a single event loop
+    asyncio.run(run_command(args))
 
 if __name__ == '__main__':
     main()
\ No newline at end of file
@@ -7,25 +7,53 @@ It offers easy access to documentation patterns and examples for Claude Code and
 """
 
 import asyncio
+import functools
 import json
 import logging
 import os
+import random
 import re
 import sqlite3
 import sys
-from datetime import datetime
+import threading
+import urllib.robotparser
+from collections import OrderedDict
+from contextlib import contextmanager, nullcontext
+from datetime import datetime, timedelta
 from pathlib import Path
-from typing import Any, Dict, List, Optional, Sequence
+from types import MappingProxyType
+from typing import Any, Dict, List, Mapping, Optional, Sequence, Tuple, Union
 from urllib.parse import urljoin, urlparse
 
 import aiohttp
 import mcp.server.stdio
 import mcp.types as types
-from bs4 import BeautifulSoup
+import soupsieve
+from bs4 import BeautifulSoup, FeatureNotFound, NavigableString, SoupStrainer, Tag
 from mcp.server import NotificationOptions, Server
 from mcp.server.models import InitializationOptions
 from pydantic import AnyUrl
 
+# orjson parses JSON several times faster than the json module when installed
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# lxml's own tree is used directly where BeautifulSoup objects aren't needed
+try:
+    import lxml.etree
+    import lxml.html
+except ImportError:
+    lxml = None
+
+# uvloop's libuv-based event loop has less overhead per read and write on
+# the stdio transport; it isn't available on Windows
+try:
+    import uvloop
+except ImportError:
+    uvloop = None
+
 # Import the documentation indexer
 try:
     from doc_indexer import DocumentationIndexer
@@ -48,70 +76,121 @@ except ImportError:
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger("amplify-docs-server")
 
+def parse_html(html: Union[str, bytes], encoding: Optional[str] = None,
+               parse_only: Optional[SoupStrainer] = None) -> BeautifulSoup:
+    """Parse HTML with the C-based lxml parser, falling back to html.parser if lxml is missing."""
+    # Raw bytes are decoded by the parser, using the HTTP charset when known.
+    # Attributes like class are kept as plain strings rather than split into
+    # lists per element; CSS selectors still match individual class names.
+    options = dict(from_encoding=encoding, parse_only=parse_only, multi_valued_attributes=None)
+    try:
+        return BeautifulSoup(html, 'lxml', **options)
+    except FeatureNotFound:
+        return BeautifulSoup(html, 'html.parser', **options)
+
+# discover_urls only needs links, so it builds a tree of just the <a href> tags
+LINK_STRAINER = SoupStrainer('a', href=True)
+# The same links as an lxml query; plain strings don't keep the tree alive
+LINK_HREF_XPATH = lxml.etree.XPath('//a/@href', smart_strings=False) if lxml is not None else None
+
+def extract_hrefs(html: bytes, encoding: Optional[str] = None) -> List[str]:
+    """Get the href of every <a> tag in a page, in document order."""
+    if lxml is not None:
+        # Querying lxml's tree skips building a BeautifulSoup object per link
+        if encoding is None:
+            # Without an HTTP charset lxml assumes latin-1 unless the page
+            # declares one; prefer UTF-8 when the bytes are valid UTF-8, as
+            # BeautifulSoup's guessing does
+            try:
+                html.decode('utf-8')
+                encoding = 'utf-8'
+            except UnicodeDecodeError:
+                pass
+        try:
+            parser = lxml.html.HTMLParser(encoding=encoding) if encoding else None
+            return LINK_HREF_XPATH(lxml.html.document_fromstring(html, parser=parser))
+        except lxml.etree.ParserError:
+            # lxml rejects documents with no content at all
+            return []
+        except LookupError:
+            # An unknown charset name; let BeautifulSoup guess the encoding
+            encoding = None
+    soup = parse_html(html, encoding, LINK_STRAINER)
+    # The strainer keeps only <a href> tags, all at the top level, so the
+    # children are the links and nothing has to search the tree
+    return [link['href'] for link in soup.children if link.name == 'a']
+
 # Search enhancement functions
-def detect_query_intent(query: str) -> str:
-    """Detect the intent behind a search query to provide better results."""
-    query_lower = query.lower()
-    
+
+# Intent keywords, checked in order as substrings of the lowercased query;
+# the first intent with a match wins
+QUERY_INTENT_TERMS = (
     # Setup/initialization intent
-    if any(term in query_lower for term in ['create', 'start', 'new', 'init', 'setup', 'begin', 'template', 'clone']):
-        return 'setup'
-    
+    ('setup', ('create', 'start', 'new', 'init', 'setup', 'begin', 'template', 'clone')),
     # Authorization/security intent
-    if any(term in query_lower for term in ['auth', 'owner', 'allow', 'permission', 'access', 'security', 'authenticated', 'identityClaim']):
-        return 'auth'
-    
+    ('auth', ('auth', 'owner', 'allow', 'permission', 'access', 'security', 'authenticated', 'identityClaim')),
     # Data modeling intent
-    if any(term in query_lower for term in ['model', 'schema', 'data', 'field', 'type', 'relationship', 'hasMany', 'belongsTo']):
-        return 'data'
-    
+    ('data', ('model', 'schema', 'data', 'field', 'type', 'relationship', 'hasMany', 'belongsTo')),
     # Error/troubleshooting intent
-    if any(term in query_lower for term in ['error', 'issue', 'problem', 'fail', 'not working', 'undefined', 'mistake']):
-        return 'error'
-    
+    ('error', ('error', 'issue', 'problem', 'fail', 'not working', 'undefined', 'mistake')),
     # Timestamp/date handling
-    if any(term in query_lower for term in ['timestamp', 'createdAt', 'updatedAt', 'date', 'time']):
-        return 'timestamps'
-    
+    ('timestamps', ('timestamp', 'createdAt', 'updatedAt', 'date', 'time')),
     # Import/module intent
-    if any(term in query_lower for term in ['import', 'require', 'module', '.js', 'extension', 'typescript']):
-        return 'imports'
+    ('imports', ('import', 'require', 'module', '.js', 'extension', 'typescript')),
+)
+
+# Agents often repeat a query or search again with small changes, so the query
+# analysis helpers below remember recent inputs
+QUERY_ANALYSIS_CACHE_SIZE = 1024
+
+@functools.lru_cache(maxsize=QUERY_ANALYSIS_CACHE_SIZE)
+def detect_query_intent(query: str) -> str:
+    """Detect the intent behind a search query to provide better results."""
+    query_lower = query.lower()
+    
+    # Plain loops over the table beat any() generators and a regex
+    # alternation for these short queries
+    for intent, terms in QUERY_INTENT_TERMS:
+        for term in terms:
+            if term in query_lower:
+                return intent
     
     return 'general'
 
-def expand_query_terms(query: str, intent: str) -> List[str]:
+# Extra search terms per intent, added when the query contains the key term
+QUERY_EXPANSIONS = {
+    'setup': {
+        'create': ['setup', 'initialize', 'new project', 'getting started', 'npx create-next-app'],
+        'template': ['DO NOT clone', 'npx create-next-app', 'setup', 'initialization'],
+        'clone': ['DO NOT clone template', 'use npx create-next-app instead', 'setup correctly']
+    },
+    'auth': {
+        'owner': ['authorization', 'ownership', 'allow.owner()', 'NOT ownerField'],
+        'authenticated': ['allow.authenticated()', 'authorization rules', 'auth patterns'],
+        'identityClaim': ['INCORRECT syntax', 'use allow.owner() instead', 'authorization']
+    },
+    'data': {
+        'model': ['defineData', 'schema', 'data modeling', 'relationships'],
+        'timestamp': ['automatic timestamps', 'createdAt updatedAt automatic', 'DO NOT add manually']
+    },
+    'timestamps': {
+        'createdAt': ['automatic fields', 'DO NOT add manually', 'handled by Amplify'],
+        'updatedAt': ['automatic fields', 'DO NOT add manually', 'handled by Amplify']
+    },
+    'imports': {
+        '.js': ['TypeScript imports', 'DO NOT use .js extension', 'import paths'],
+        'import': ['module imports', 'TypeScript', 'correct import syntax']
+    }
+}
+
+@functools.lru_cache(maxsize=QUERY_ANALYSIS_CACHE_SIZE)
+def expand_query_terms(query: str, intent: str) -> Tuple[str, ...]:
     """Expand query terms based on intent to find more relevant results."""
     expanded = [query]
     query_lower = query.lower()
     
-    # Intent-specific expansions
-    expansions = {
-        'setup': {
-            'create': ['setup', 'initialize', 'new project', 'getting started', 'npx create-next-app'],
-            'template': ['DO NOT clone', 'npx create-next-app', 'setup', 'initialization'],
-            'clone': ['DO NOT clone template', 'use npx create-next-app instead', 'setup correctly']
-        },
-        'auth': {
-            'owner': ['authorization', 'ownership', 'allow.owner()', 'NOT ownerField'],
-            'authenticated': ['allow.authenticated()', 'authorization rules', 'auth patterns'],
-            'identityClaim': ['INCORRECT syntax', 'use allow.owner() instead', 'authorization']
-        },
-        'data': {
-            'model': ['defineData', 'schema', 'data modeling', 'relationships'],
-            'timestamp': ['automatic timestamps', 'createdAt updatedAt automatic', 'DO NOT add manually']
-        },
-        'timestamps': {
-            'createdAt': ['automatic fields', 'DO NOT add manually', 'handled by Amplify'],
-            'updatedAt': ['automatic fields', 'DO NOT add manually', 'handled by Amplify']
-        },
-        'imports': {
-            '.js': ['TypeScript imports', 'DO NOT use .js extension', 'import paths'],
-            'import': ['module imports', 'TypeScript', 'correct import syntax']
-        }
-    }
-    
     # Add expansions based on detected terms
-    for term, expansion_list in expansions.get(intent, {}).items():
+    for term, expansion_list in QUERY_EXPANSIONS.get(intent, {}).items():
         if term in query_lower:
             expanded.extend(expansion_list)
     
@@ -119,49 +198,52 @@ def expand_query_terms(query: str, intent: str) -> List[str]:
     if 'error' in intent or 'mistake' in query_lower:
         expanded.extend(['common mistakes', 'pitfalls', 'troubleshooting', 'correct way'])
     
-    return list(set(expanded))  # Remove duplicates
+    return tuple(set(expanded))  # Remove duplicates
+
+# Query patterns for common mistakes, compiled once, with the correction to show
+ANTI_PATTERNS = [(re.compile(pattern, re.IGNORECASE), info) for pattern, info in {
+    # Template confusion
+    r'clone.*template|git clone.*amplify': {
+        'issue': 'Cloning GitHub template',
+        'correction': 'Use npx create-next-app@14.2.10 instead of cloning',
+        'severity': 'high'
+    },
+    # Authorization mistakes
+    r'owner_?field|identityClaim': {
+        'issue': 'Incorrect ownership syntax',
+        'correction': 'Use allow.owner() not .ownerField().identityClaim()',
+        'severity': 'high'
+    },
+    # Timestamp handling
+    r'(?:created|updated)At.*string|manually.*timestamp': {
+        'issue': 'Manual timestamp management',
+        'correction': 'Amplify handles createdAt/updatedAt automatically',
+        'severity': 'medium'
+    },
+    # Import confusion
+    r'(?:import|require).*\.js': {
+        'issue': 'JS extension in TypeScript imports',
+        'correction': 'Do not use .js extensions in TypeScript imports',
+        'severity': 'medium'
+    },
+    # Directory creation
+    r'no such file|cannot find.*amplify|mkdir': {
+        'issue': 'Missing directory',
+        'correction': 'Create directories with mkdir -p amplify/auth amplify/data',
+        'severity': 'high'
+    }
+}.items()]
 
-def detect_anti_patterns(query: str) -> Dict[str, str]:
+@functools.lru_cache(maxsize=QUERY_ANALYSIS_CACHE_SIZE)
+def detect_anti_patterns(query: str) -> Mapping[str, Dict[str, str]]:
     """Detect common anti-patterns in queries and provide corrections."""
-    anti_patterns = {
-        # Template confusion
-        r'clone.*template|git clone.*amplify': {
-            'issue': 'Cloning GitHub template',
-            'correction': 'Use npx create-next-app@14.2.10 instead of cloning',
-            'severity': 'high'
-        },
-        # Authorization mistakes
-        r'ownerField|owner_field|identityClaim': {
-            'issue': 'Incorrect ownership syntax',
-            'correction': 'Use allow.owner() not .ownerField().identityClaim()',
-            'severity': 'high'
-        },
-        # Timestamp handling
-        r'createdAt.*string|updatedAt.*string|manually.*timestamp': {
-            'issue': 'Manual timestamp management',
-            'correction': 'Amplify handles createdAt/updatedAt automatically',
-            'severity': 'medium'
-        },
-        # Import confusion
-        r'import.*\.js|require.*\.js': {
-            'issue': 'JS extension in TypeScript imports',
-            'correction': 'Do not use .js extensions in TypeScript imports',
-            'severity': 'medium'
-        },
-        # Directory creation
-        r'no such file|cannot find.*amplify|mkdir': {
-            'issue': 'Missing directory',
-            'correction': 'Create directories with mkdir -p amplify/auth amplify/data',
-            'severity': 'high'
-        }
-    }
-    
     detected = {}
-    for pattern, info in anti_patterns.items():
-        if re.search(pattern, query, re.IGNORECASE):
-            detected[pattern] = info
+    for regex, info in ANTI_PATTERNS:
+        if regex.search(query):
+            detected[regex.pattern] = info
     
-    return detected
+    # Read-only, since every caller with the same query shares the cached result
+    return MappingProxyType(detected)
 
 def get_contextual_warnings(context: Dict[str, Any]) -> List[Dict[str, str]]:
     """Get contextual warnings based on current activity."""
@@ -256,62 +338,384 @@ def calculate_relevance_boost(doc: Dict[str, Any], query: str, intent: str) -> f
     return boost
 
 # CRITICAL: Validation to prevent incorrect commands
+# Commands that must never reach a client, longest first so a full command is
+# replaced before its shorter fragments
+FORBIDDEN_COMMANDS = (
+    "npx create-amplify@latest --template nextjs",
+    "create-amplify@latest --template",
+    "create-amplify@latest"
+)
+# Every forbidden command contains this, so one scan rules them all out
+FORBIDDEN_COMMAND_MARKER = "create-amplify@latest"
+FORBIDDEN_COMMAND_REPLACEMENT = "npx create-next-app@14.2.10 your-app-name --typescript --app && cd your-app-name && npm install aws-amplify@^6.6.0"
+
 def validate_response(response_text: str) -> str:
     """Validate that response doesn't contain forbidden commands."""
-    FORBIDDEN_COMMANDS = [
-        "npx create-amplify@latest --template nextjs",
-        "create-amplify@latest --template",
-        "create-amplify@latest"
-    ]
-    
+    if FORBIDDEN_COMMAND_MARKER not in response_text:
+        return response_text
+
     for forbidden in FORBIDDEN_COMMANDS:
         if forbidden in response_text:
             logger.error(f"CRITICAL: Forbidden command '{forbidden}' detected in response!")
-            response_text = response_text.replace(
-                forbidden, 
-                "npx create-next-app@14.2.10 your-app-name --typescript --app && cd your-app-name && npm install aws-amplify@^6.6.0"
-            )
-    
+            response_text = response_text.replace(forbidden, FORBIDDEN_COMMAND_REPLACEMENT)
+
     return response_text
 
 # Database setup
 DB_PATH = "amplify_docs.db"
+# Full-text tokenizer; folding diacritics lets "resume" match "résumé"
+FTS_TOKENIZER = "unicode61 remove_diacritics 2"
+# Non-unique indexes that bulk loads drop and rebuild (idx_url stays, since
+# upserts look rows up by url)
+SECONDARY_INDEXES = {
+    'idx_title': 'documents(title)',
+    # Both also serve lookups by category alone; the second column lets the
+    # newest pages of a category, and the export's category/title order, be
+    # read in index order instead of sorted
+    'idx_category_scraped': 'documents(category, last_scraped)',
+    'idx_category_title': 'documents(category, title)',
+}
+# Indexes older databases have that the ones above replace
+RETIRED_INDEXES = ('idx_category',)
+# Settings applied to every connection. journal_mode=WAL is stored in the
+# database file, so init_database() sets that once; under WAL, searches read
+# while a scrape writes and synchronous=NORMAL stays crash-safe
+CONNECTION_PRAGMAS = (
+    "PRAGMA synchronous=NORMAL",
+    "PRAGMA temp_store=MEMORY",
+    "PRAGMA cache_size=-65536",
+    # Read pages through a memory map instead of copying them via read()
+    "PRAGMA mmap_size=268435456",
+)
+# Search results kept per thread; the cache empties whenever the database changes
+SEARCH_CACHE_SIZE = 512
+# Document columns a search returns unless the caller names fewer
+SEARCH_RESULT_COLUMNS = ('url', 'title', 'content', 'category', 'last_scraped')
+# Columns a caller may ask a search for
+SEARCH_COLUMN_CHOICES = frozenset(SEARCH_RESULT_COLUMNS + ('markdown_content', 'code_blocks'))
+
+# A fenced code block: a line that is only ``` (plus whitespace), the lines
+# after it, and the next such line
+CODE_BLOCK_PATTERN = re.compile(r'^[^\S\n]*```[^\S\n]*\n(.*?)^[^\S\n]*```[^\S\n]*$', re.MULTILINE | re.DOTALL)
+
+def extract_code_blocks(markdown: Optional[str]) -> str:
+    """Get a document's non-empty fenced code blocks, without fences, as a JSON list."""
+    # The captured text ends with the newline before the closing fence
+    return json.dumps([
+        match.group(1)[:-1]
+        for match in CODE_BLOCK_PATTERN.finditer(markdown or '')
+        if match.group(1)
+    ])
+
+# Tables and indexes, created in one script and one transaction
+SCHEMA_SQL = """
+    BEGIN;
+    CREATE TABLE IF NOT EXISTS documents (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        url TEXT UNIQUE NOT NULL,
+        title TEXT NOT NULL,
+        content TEXT NOT NULL,
+        markdown_content TEXT,
+        category TEXT,
+        last_scraped TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+        embedding_vector TEXT,
+        code_blocks TEXT
+    );
+    CREATE TABLE IF NOT EXISTS scrape_metadata (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        base_url TEXT NOT NULL,
+        total_pages INTEGER,
+        last_full_scrape TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+        status TEXT DEFAULT 'in_progress'
+    );
+    CREATE INDEX IF NOT EXISTS idx_url ON documents(url);
+""" + "".join(
+    f"    DROP INDEX IF EXISTS {index_name};\n" for index_name in RETIRED_INDEXES
+) + "".join(
+    f"    CREATE INDEX IF NOT EXISTS {index_name} ON {index_target};\n"
+    for index_name, index_target in SECONDARY_INDEXES.items()
+) + "    COMMIT;\n"
+
+# Full-text index over documents, kept in sync by triggers. Updates that
+# leave the indexed text alone (a rescrape of an unchanged page, the
+# code_blocks backfill) don't touch the index
+FTS_SCHEMA_SQL = f"""
+    BEGIN;
+    CREATE VIRTUAL TABLE IF NOT EXISTS documents_fts USING fts5(
+        title, content, url,
+        content='documents', content_rowid='id',
+        tokenize='{FTS_TOKENIZER}'
+    );
+    CREATE TRIGGER IF NOT EXISTS documents_fts_insert AFTER INSERT ON documents BEGIN
+        INSERT INTO documents_fts(rowid, title, content, url)
+        VALUES (new.id, new.title, new.content, new.url);
+    END;
+    CREATE TRIGGER IF NOT EXISTS documents_fts_delete AFTER DELETE ON documents BEGIN
+        INSERT INTO documents_fts(documents_fts, rowid, title, content, url)
+        VALUES ('delete', old.id, old.title, old.content, old.url);
+    END;
+    CREATE TRIGGER IF NOT EXISTS documents_fts_update AFTER UPDATE ON documents
+    WHEN old.title IS NOT new.title OR old.content IS NOT new.content OR old.url IS NOT new.url
+    BEGIN
+        INSERT INTO documents_fts(documents_fts, rowid, title, content, url)
+        VALUES ('delete', old.id, old.title, old.content, old.url);
+        INSERT INTO documents_fts(rowid, title, content, url)
+        VALUES (new.id, new.title, new.content, new.url);
+    END;
+    COMMIT;
+"""
 
-def init_database():
+# Database files whose schema this process has already set up
+_initialized_databases = set()
+_init_lock = threading.Lock()
+
+def init_database(db_path: str = DB_PATH):
     """Initialize the SQLite database for storing scraped documentation."""
-    conn = sqlite3.connect(DB_PATH)
+    conn = sqlite3.connect(db_path)
+    conn.execute("PRAGMA journal_mode=WAL")
+    for pragma in CONNECTION_PRAGMAS:
+        conn.execute(pragma)
     cursor = conn.cursor()
     
-    cursor.execute("""
-        CREATE TABLE IF NOT EXISTS documents (
-            id INTEGER PRIMARY KEY AUTOINCREMENT,
-            url TEXT UNIQUE NOT NULL,
-            title TEXT NOT NULL,
-            content TEXT NOT NULL,
-            markdown_content TEXT,
-            category TEXT,
-            last_scraped TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-            embedding_vector TEXT
-        )
-    """)
-    
-    cursor.execute("""
-        CREATE TABLE IF NOT EXISTS scrape_metadata (
-            id INTEGER PRIMARY KEY AUTOINCREMENT,
-            base_url TEXT NOT NULL,
-            total_pages INTEGER,
-            last_full_scrape TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-            status TEXT DEFAULT 'in_progress'
+    cursor.executescript(SCHEMA_SQL)
+    
+    # Drop an update trigger from before it checked for changed text;
+    # FTS_SCHEMA_SQL below creates the current one
+    cursor.execute("SELECT sql FROM sqlite_master WHERE type='trigger' AND name='documents_fts_update'")
+    row = cursor.fetchone()
+    if row and 'WHEN' not in row[0]:
+        cursor.execute("DROP TRIGGER documents_fts_update")
+    
+    # Code blocks are extracted when a document is saved, so findPatterns doesn't
+    # rescan markdown per call; fill them in for documents saved before that
+    columns = {row[1] for row in cursor.execute("PRAGMA table_info(documents)")}
+    if 'code_blocks' not in columns:
+        cursor.execute("ALTER TABLE documents ADD COLUMN code_blocks TEXT")
+    cursor.execute("SELECT id, markdown_content FROM documents WHERE code_blocks IS NULL")
+    missing = cursor.fetchall()
+    if missing:
+        cursor.executemany(
+            "UPDATE documents SET code_blocks = ? WHERE id = ?",
+            [(extract_code_blocks(markdown), doc_id) for doc_id, markdown in missing]
         )
-    """)
+        conn.commit()
     
-    # Create indexes for better search performance
-    cursor.execute("CREATE INDEX IF NOT EXISTS idx_url ON documents(url)")
-    cursor.execute("CREATE INDEX IF NOT EXISTS idx_title ON documents(title)")
-    cursor.execute("CREATE INDEX IF NOT EXISTS idx_category ON documents(category)")
+    # search_documents falls back to LIKE scans when SQLite is built without FTS5
+    try:
+        cursor.execute("SELECT sql FROM sqlite_master WHERE type='table' AND name='documents_fts'")
+        row = cursor.fetchone()
+        fts_exists = row is not None
+        
+        # Recreate an index built with an older tokenizer; it is rebuilt below
+        if fts_exists and FTS_TOKENIZER not in row[0]:
+            cursor.execute("DROP TABLE documents_fts")
+            fts_exists = False
+        
+        cursor.executescript(FTS_SCHEMA_SQL)
+        
+        # Index documents saved before the full-text table existed
+        if not fts_exists:
+            cursor.execute("INSERT INTO documents_fts(documents_fts) VALUES ('rebuild')")
+    except sqlite3.OperationalError as e:
+        if conn.in_transaction:
+            conn.rollback()
+        logger.warning(f"FTS5 not available, search will use LIKE scans: {e}")
     
     conn.commit()
     conn.close()
+    _initialized_databases.add(db_path)
+
+def ensure_database(db_path: str = DB_PATH):
+    """Run init_database() for a database file once per process."""
+    if db_path in _initialized_databases:
+        return
+    with _init_lock:
+        if db_path not in _initialized_databases:
+            init_database(db_path)
+
+# Common synonyms and variations - updated for Amplify Gen 2
+SEARCH_SYNONYMS = {
+    "auth": ["authentication", "auth", "signin", "signup", "login", "cognito", "authenticator"],
+    "api": ["api", "rest", "http", "endpoint", "apigateway", "custom"],
+    "data": ["data", "defineData", "model", "schema", "real-time", "subscription", "generateClient", "observeQuery"],
+    "graphql": ["graphql", "query", "mutation", "subscription"],
+    "ui": ["ui", "component", "frontend", "interface", "view", "crud", "form", "authenticator", "fileuploader"],
+    "storage": ["storage", "s3", "file", "upload", "download", "fileuploader", "uploadData", "downloadData"],
+    "db": ["database", "dynamodb", "table", "defineData", "model", "schema"],
+    "deploy": ["deploy", "deployment", "hosting", "publish", "amplify", "sandbox", "npx"],
+    "definedata": ["defineData", "data", "model", "schema", "backend"],
+    "realtime": ["real-time", "realtime", "subscription", "observeQuery", "live"],
+    "typescript": ["typescript", "types", "type-safe", "generateClient"]
+}
+
+# Common typos/variations
+SEARCH_TYPO_FIXES = {
+    "authentcation": "authentication",
+    "authentiction": "authentication", 
+    "authenitcation": "authentication",
+    "storag": "storage",
+    "graphq": "graphql",
+    "deply": "deploy",
+    "uplod": "upload",
+    "dowload": "download"
+}
+
+def _invert_synonyms(synonyms: Dict[str, List[str]]) -> Dict[str, frozenset]:
+    """Map every synonym key and value to the words a query containing it expands to."""
+    expansions: Dict[str, set] = {}
+    for key, values in synonyms.items():
+        for word in {key, *values}:
+            expansions.setdefault(word, set()).update(values)
+    return {word: frozenset(words) for word, words in expansions.items()}
+
+# Built once so expanding a query word is one dict lookup
+SYNONYM_EXPANSIONS = _invert_synonyms(SEARCH_SYNONYMS)
+
+# Word characters as FTS5's default unicode61 tokenizer sees them
+FTS_TOKEN_PATTERN = re.compile(r'[^\W_]+')
+
+def build_fts_query(words) -> str:
+    """Build an FTS5 MATCH expression that prefix-matches any of the given words."""
+    terms = []
+    for word in sorted(words):
+        tokens = FTS_TOKEN_PATTERN.findall(word)
+        if tokens:
+            # Quoting keeps FTS5 operators and punctuation in user input literal
+            terms.append('"' + ' '.join(tokens) + '"*')
+    return ' OR '.join(terms)
+
+USER_AGENT = 'Amplify-Docs-MCP-Server/1.0 (Educational Tool)'
+
+# Shared HTTP session so every scrape reuses pooled keep-alive connections
+_session: Optional[aiohttp.ClientSession] = None
+
+async def get_session() -> aiohttp.ClientSession:
+    """Get the shared aiohttp session, creating it on first use."""
+    global _session
+    if _session is None or _session.closed:
+        # Every page lives on one CDN host, so keep its connections and DNS
+        # answer alive across the whole crawl rather than aiohttp's 15s/10s defaults
+        connector = aiohttp.TCPConnector(
+            limit=100,
+            limit_per_host=10,
+            enable_cleanup_closed=True,
+            keepalive_timeout=30,
+            ttl_dns_cache=300
+        )
+        _session = aiohttp.ClientSession(
+            connector=connector,
+            timeout=aiohttp.ClientTimeout(total=30),
+            headers={
+                'User-Agent': USER_AGENT
+            }
+        )
+    return _session
+
+async def close_session():
+    """Close the shared aiohttp session if one is open."""
+    global _session
+    if _session is not None and not _session.closed:
+        await _session.close()
+    _session = None
+
+# Pages fetched at once while scraping, and the minimum spacing between
+# request starts to any one host. Every page lives on one host, so the
+# spacing, not the concurrency, sets the crawl rate: at most one request
+# every 1.5s, or slower if robots.txt asks for it
+SCRAPE_CONCURRENCY = 10
+SCRAPE_HOST_INTERVAL_SECONDS = 1.5
+# Pages saved more recently than this are not fetched again by a resumed
+# scrape, so rerunning an interrupted one only fetches what is new or stale
+SCRAPE_RESUME_MAX_AGE = timedelta(days=7)
+# Fetched pages saved per transaction while a scrape is running
+SCRAPE_SAVE_BATCH_SIZE = 50
+# Attempts per page when the server answers 429 or 5xx; waits double each time
+# (1s, 2s, 4s, ...) unless Retry-After says otherwise, capped at the max delay
+SCRAPE_RETRY_ATTEMPTS = 5
+SCRAPE_RETRY_MAX_DELAY_SECONDS = 60.0
+# Bytes of a page body kept for parsing; anything past this is dropped
+SCRAPE_MAX_PAGE_BYTES = 5 * 1024 * 1024
+
+# Main-content selectors in priority order, compiled once. They are tried one
+# at a time because a combined selector would return the first match in
+# document order rather than the highest-priority one.
+CONTENT_SELECTORS = [
+    soupsieve.compile(selector) for selector in (
+        'main', '[role="main"]', '.content', '#content',
+        'article', '.documentation-content'
+    )
+]
+
+# Link fragments that mark a URL as not being a documentation page
+SKIP_URL_PARTS = ('#', 'javascript:', 'mailto:')
+
+# URL path sections and their categories, in the order categorize_url prefers them
+URL_SECTION_CATEGORIES = {
+    'start': 'getting-started',
+    'deploy': 'deployment',
+    'build-a-backend': 'backend',
+    'build-ui': 'frontend',
+    'gen1': 'gen1',
+    'reference': 'reference',
+    'guides': 'guides',
+}
+URL_SECTION_PRIORITY = {section: i for i, section in enumerate(URL_SECTION_CATEGORIES)}
+# The lookahead leaves the closing slash unconsumed so adjacent sections both match
+URL_SECTION_PATTERN = re.compile(r'/(' + '|'.join(map(re.escape, URL_SECTION_CATEGORIES)) + r')(?=/)')
+
+@functools.lru_cache(maxsize=4096)
+def categorize_url(url: str) -> str:
+    """Categorize documentation based on URL path."""
+    sections = URL_SECTION_PATTERN.findall(urlparse(url).path.lower())
+    if not sections:
+        return 'general'
+    # A path can name several sections; the earliest entry in URL_SECTION_CATEGORIES wins
+    return URL_SECTION_CATEGORIES[min(sections, key=URL_SECTION_PRIORITY.__getitem__)]
+
+# URL path characters that can't appear in a filename on some platforms, and the
+# longest filename stem kept (most filesystems cap names at 255 bytes)
+MARKDOWN_FILENAME_TRANSLATION = str.maketrans({char: '_' for char in '/\\:*?"<>|'})
+MARKDOWN_FILENAME_MAX_LENGTH = 200
+
+# Converters html_to_markdown dispatches to, each given an element and the text
+# of every element the walk has finished, and returning the element's lines
+def _markdown_heading(element, texts: Dict[int, str]) -> Tuple[str, ...]:
+    return (f"{'#' * int(element.name[1])} {texts[id(element)].strip()}", "")
+
+def _markdown_paragraph(element, texts: Dict[int, str]) -> Tuple[str, ...]:
+    text = texts[id(element)].strip()
+    return (text, "") if text else ()
+
+def _markdown_pre(element, texts: Dict[int, str]) -> Tuple[str, ...]:
+    return ("```", texts[id(element)], "```", "")
+
+def _markdown_code(element, texts: Dict[int, str]) -> Tuple[str, ...]:
+    text = texts[id(element)].strip()
+    return (f"`{text}`",) if text else ()
+
+def _markdown_list(element, texts: Dict[int, str]) -> Tuple[str, ...]:
+    items = [f"- {texts[id(child)].strip()}" for child in element.children if child.name == 'li']
+    items.append("")
+    return tuple(items)
+
+MARKDOWN_HANDLERS = {
+    'h1': _markdown_heading, 'h2': _markdown_heading, 'h3': _markdown_heading,
+    'h4': _markdown_heading, 'h5': _markdown_heading, 'h6': _markdown_heading,
+    'p': _markdown_paragraph,
+    'pre': _markdown_pre,
+    'code': _markdown_code,
+    'ul': _markdown_list,
+    'ol': _markdown_list,
+}
+# Elements whose text the walk records: everything with a converter, plus list
+# items for the list converter
+MARKDOWN_TEXT_TAGS = frozenset(MARKDOWN_HANDLERS) | {'li'}
+
+def _last_descendant(element):
+    """Return the node a depth-first walk of element visits last."""
+    while getattr(element, 'contents', None):
+        element = element.contents[-1]
+    return element
 
 class AmplifyDocsScraper:
     """Handles scraping of AWS Amplify documentation."""
@@ -320,162 +724,259 @@ class AmplifyDocsScraper:
         self.base_url = "https://docs.amplify.aws/nextjs/"
         self.session = None
         self.scraped_urls = set()
+        # Parsed robots.txt per origin, fetched once per scrape
+        self.robots: Dict[str, asyncio.Task] = {}
+        # Earliest loop time the next request to each origin may start
+        self.next_request_time: Dict[str, float] = {}
         
     async def __aenter__(self):
-        self.session = aiohttp.ClientSession(
-            timeout=aiohttp.ClientTimeout(total=30),
-            headers={
-                'User-Agent': 'Amplify-Docs-MCP-Server/1.0 (Educational Tool)'
-            }
-        )
+        self.session = await get_session()
         return self
         
     async def __aexit__(self, exc_type, exc_val, exc_tb):
-        if self.session:
-            await self.session.close()
+        # The session is shared; close_session() closes it at shutdown
+        self.session = None
     
-    async def fetch_page(self, url: str) -> Optional[Dict[str, Any]]:
-        """Fetch and parse a single documentation page."""
+    async def _fetch_robots(self, origin: str) -> urllib.robotparser.RobotFileParser:
+        """Fetch and parse an origin's robots.txt; a missing file allows every URL."""
+        robots = urllib.robotparser.RobotFileParser(f"{origin}/robots.txt")
         try:
+            async with self.session.get(f"{origin}/robots.txt") as response:
+                if response.status == 200:
+                    robots.parse((await response.text()).splitlines())
+                elif response.status in (401, 403):
+                    robots.disallow_all = True
+                else:
+                    robots.allow_all = True
+        except Exception as e:
+            logger.warning(f"Could not fetch robots.txt for {origin}: {e}")
+            robots.allow_all = True
+        return robots
+    
+    async def _wait_for_turn(self, url: str) -> bool:
+        """Check robots.txt for a URL and wait for its host's next request slot."""
+        parsed = urlparse(url)
+        origin = f"{parsed.scheme}://{parsed.netloc}"
+        
+        # Concurrent fetches share one in-flight robots.txt request per origin
+        if origin not in self.robots:
+            self.robots[origin] = asyncio.ensure_future(self._fetch_robots(origin))
+        robots = await self.robots[origin]
+        if not robots.can_fetch(USER_AGENT, url):
+            logger.info(f"Skipping {url}: disallowed by robots.txt")
+            return False
+        
+        # Reserve the next slot for this host before sleeping, so concurrent
+        # fetches queue up behind each other instead of all waking together
+        now = asyncio.get_running_loop().time()
+        start = max(now, self.next_request_time.get(origin, now))
+        self.next_request_time[origin] = start + self._host_interval(robots)
+        if start > now:
+            await asyncio.sleep(start - now)
+        return True
+    
+    def _host_interval(self, robots: urllib.robotparser.RobotFileParser) -> float:
+        """Seconds between requests to a host: our own spacing, or more if robots.txt asks for it."""
+        interval = SCRAPE_HOST_INTERVAL_SECONDS
+        crawl_delay = robots.crawl_delay(USER_AGENT)
+        if crawl_delay:
+            interval = max(interval, float(crawl_delay))
+        request_rate = robots.request_rate(USER_AGENT)
+        if request_rate and request_rate.requests:
+            interval = max(interval, request_rate.seconds / request_rate.requests)
+        return interval
+    
+    def _retry_delay(self, response: aiohttp.ClientResponse, attempt: int) -> float:
+        """Seconds to wait before retrying a throttled or failed request."""
+        delay = 2 ** attempt
+        if response.status in (429, 503):
+            try:
+                delay = float(response.headers.get('Retry-After', delay))
+            except ValueError:
+                # HTTP-date form; fall back to the exponential delay
+                pass
+        return min(delay, SCRAPE_RETRY_MAX_DELAY_SECONDS) + random.random()
+    
+    async def _read_capped(self, url: str, response: aiohttp.ClientResponse) -> bytes:
+        """Read a response body, stopping at SCRAPE_MAX_PAGE_BYTES."""
+        body = bytearray()
+        async for chunk in response.content.iter_any():
+            body += chunk
+            if len(body) >= SCRAPE_MAX_PAGE_BYTES:
+                logger.warning(f"Truncating {url} at {SCRAPE_MAX_PAGE_BYTES} bytes")
+                del body[SCRAPE_MAX_PAGE_BYTES:]
+                break
+        return bytes(body)
+    
+    async def _get_html(self, url: str) -> Optional[tuple]:
+        """GET a page, retrying 429 and 5xx responses; returns (body, charset) on 200."""
+        for attempt in range(SCRAPE_RETRY_ATTEMPTS):
+            if not await self._wait_for_turn(url):
+                return None
+            
             async with self.session.get(url) as response:
                 if response.status == 200:
-                    html_content = await response.text()
-                    soup = BeautifulSoup(html_content, 'html.parser')
-                    
-                    # Extract title
-                    title = "Untitled"
-                    title_elem = soup.find('h1') or soup.find('title')
-                    if title_elem:
-                        title = title_elem.get_text().strip()
-                    
-                    # Extract main content
-                    content_selectors = [
-                        'main', '[role="main"]', '.content', '#content',
-                        'article', '.documentation-content'
-                    ]
+                    return await self._read_capped(url, response), response.charset
+                if response.status != 429 and response.status < 500:
+                    return None
+                if attempt == SCRAPE_RETRY_ATTEMPTS - 1:
+                    logger.warning(f"Giving up on {url} after {SCRAPE_RETRY_ATTEMPTS} attempts (HTTP {response.status})")
+                    return None
+                delay = self._retry_delay(response, attempt)
+            
+            # Push back the host's next slot so other fetches to it slow down too
+            parsed = urlparse(url)
+            origin = f"{parsed.scheme}://{parsed.netloc}"
+            resume_at = asyncio.get_running_loop().time() + delay
+            self.next_request_time[origin] = max(self.next_request_time.get(origin, resume_at), resume_at)
+            logger.info(f"HTTP {response.status} for {url}, retrying in {delay:.1f}s")
+        return None
+    
+    async def fetch_page(self, url: str) -> Optional[Dict[str, Any]]:
+        """Fetch and parse a single documentation page."""
+        try:
+            page = await self._get_html(url)
+            if page is not None:
+                # Hand the raw body to the parser instead of decoding it to str first
+                soup = parse_html(*page)
+                
+                # Extract title
+                title = "Untitled"
+                title_elem = soup.find('h1') or soup.find('title')
+                if title_elem:
+                    title = title_elem.get_text().strip()
+                
+                # Extract main content
+                content_elem = None
+                for selector in CONTENT_SELECTORS:
+                    content_elem = selector.select_one(soup)
+                    if content_elem:
+                        break
+                
+                if not content_elem:
+                    content_elem = soup.find('body')
+                
+                if content_elem:
+                    # Convert to markdown-like format
+                    raw_content, markdown_content = self.extract_text_and_markdown(content_elem)
                     
-                    content_elem = None
-                    for selector in content_selectors:
-                        content_elem = soup.select_one(selector)
-                        if content_elem:
-                            break
+                    # Determine category from URL
+                    category = self.categorize_url(url)
                     
-                    if not content_elem:
-                        content_elem = soup.find('body')
+                    return {
+                        'url': url,
+                        'title': title,
+                        'content': raw_content,
+                        'markdown_content': markdown_content,
+                        'category': category
+                    }
                     
-                    if content_elem:
-                        # Convert to markdown-like format
-                        markdown_content = self.html_to_markdown(content_elem)
-                        raw_content = content_elem.get_text(separator='\n', strip=True)
-                        
-                        # Determine category from URL
-                        category = self.categorize_url(url)
-                        
-                        return {
-                            'url': url,
-                            'title': title,
-                            'content': raw_content,
-                            'markdown_content': markdown_content,
-                            'category': category
-                        }
-                        
         except Exception as e:
             logger.error(f"Error fetching {url}: {e}")
             return None
     
     def html_to_markdown(self, soup) -> str:
         """Convert HTML content to markdown format."""
-        # Remove script and style elements
-        for script in soup(["script", "style"]):
-            script.decompose()
-        
-        markdown_lines = []
+        return self.extract_text_and_markdown(soup)[1]
+    
+    def extract_text_and_markdown(self, soup) -> Tuple[str, str]:
+        """Get an element's plain text and its markdown conversion in one tree walk."""
+        # get_text() already skips <script> and <style> strings, so those tags
+        # are not removed first. One walk over the tree collects the strings
+        # get_text() would, both for the whole element and, sliced out when the
+        # walk leaves them, for each converted element, so no subtree is walked
+        # twice. Each converter fills the slot its element reserved on entry,
+        # keeping the lines in the document order find_all() gave.
+        text_types = soup.interesting_string_types or Tag.MAIN_CONTENT_STRING_TYPES
+        element_text_types = Tag.MAIN_CONTENT_STRING_TYPES
+        text_parts = []
+        strings = []
+        texts = {}
+        markdown_slots = []
+        # (last descendant, element, first string index, slot) for each element
+        # whose subtree the walk is inside, and the node that ends the innermost one
+        open_elements = []
+        closing_node = None
+        # Open <pre> elements around the walk; code anywhere inside one, not just
+        # directly, is already emitted as part of the fenced block
+        pre_depth = int(soup.name == 'pre' or soup.find_parent('pre') is not None)
         
-        for element in soup.find_all(['h1', 'h2', 'h3', 'h4', 'h5', 'h6', 'p', 'pre', 'code', 'ul', 'ol', 'li']):
-            if element.name.startswith('h'):
-                level = int(element.name[1])
-                markdown_lines.append(f"{'#' * level} {element.get_text().strip()}")
-                markdown_lines.append("")
-            elif element.name == 'p':
-                text = element.get_text().strip()
-                if text:
-                    markdown_lines.append(text)
-                    markdown_lines.append("")
-            elif element.name == 'pre':
-                code_content = element.get_text()
-                markdown_lines.append("```")
-                markdown_lines.append(code_content)
-                markdown_lines.append("```")
-                markdown_lines.append("")
-            elif element.name == 'code' and element.parent.name != 'pre':
-                text = element.get_text().strip()
-                if text:
-                    markdown_lines.append(f"`{text}`")
-            elif element.name in ['ul', 'ol']:
-                # Handle lists
-                for li in element.find_all('li', recursive=False):
-                    markdown_lines.append(f"- {li.get_text().strip()}")
-                markdown_lines.append("")
+        for element in soup.descendants:
+            if isinstance(element, NavigableString):
+                string_type = type(element)
+                if string_type in text_types:
+                    text = element.strip()
+                    if text:
+                        text_parts.append(text)
+                if string_type in element_text_types:
+                    strings.append(element)
+            elif element.name in MARKDOWN_TEXT_TAGS and not (pre_depth and element.name == 'code'):
+                if element.name == 'pre':
+                    pre_depth += 1
+                slot = None
+                if element.name in MARKDOWN_HANDLERS:
+                    slot = len(markdown_slots)
+                    markdown_slots.append(())
+                closing_node = _last_descendant(element)
+                open_elements.append((closing_node, element, len(strings), slot))
+            
+            while element is closing_node:
+                _, closed, start, slot = open_elements.pop()
+                if closed.name == 'pre':
+                    pre_depth -= 1
+                texts[id(closed)] = ''.join(strings[start:])
+                if slot is not None:
+                    markdown_slots[slot] = MARKDOWN_HANDLERS[closed.name](closed, texts)
+                closing_node = open_elements[-1][0] if open_elements else None
         
-        return '\n'.join(markdown_lines)
+        markdown_lines = [line for lines in markdown_slots for line in lines]
+        return '\n'.join(text_parts), '\n'.join(markdown_lines)
     
     def categorize_url(self, url: str) -> str:
         """Categorize documentation based on URL path."""
-        path = urlparse(url).path.lower()
-        
-        if '/start/' in path:
-            return 'getting-started'
-        elif '/deploy/' in path:
-            return 'deployment'
-        elif '/build-a-backend/' in path:
-            return 'backend'
-        elif '/build-ui/' in path:
-            return 'frontend'
-        elif '/gen1/' in path:
-            return 'gen1'
-        elif '/reference/' in path:
-            return 'reference'
-        elif '/guides/' in path:
-            return 'guides'
-        else:
-            return 'general'
+        return categorize_url(url)
     
     async def discover_urls(self, start_url: str, max_depth: int = 3) -> List[str]:
         """Discover all documentation URLs starting from a base URL."""
-        discovered_urls = set()
-        to_visit = [(start_url, 0)]
-        visited = set()
+        # Every URL seen so far; each is queued at most once, at the depth it was
+        # first seen, which in BFS order is its lowest
+        discovered_urls = {start_url}
+        semaphore = asyncio.Semaphore(SCRAPE_CONCURRENCY)
         
-        while to_visit:
-            current_url, depth = to_visit.pop(0)
-            
-            if current_url in visited or depth > max_depth:
-                continue
-                
-            visited.add(current_url)
-            
-            try:
-                async with self.session.get(current_url) as response:
-                    if response.status == 200:
-                        html = await response.text()
-                        soup = BeautifulSoup(html, 'html.parser')
-                        
-                        # Find all links that are documentation pages
-                        for link in soup.find_all('a', href=True):
-                            href = link['href']
-                            full_url = urljoin(current_url, href)
-                            
-                            # Only include Amplify NextJS documentation URLs
-                            if (full_url.startswith(self.base_url) and 
-                                full_url not in visited and
-                                not any(skip in full_url for skip in ['#', 'javascript:', 'mailto:'])):
-                                discovered_urls.add(full_url)
-                                if depth < max_depth:
-                                    to_visit.append((full_url, depth + 1))
-                                    
-            except Exception as e:
-                logger.error(f"Error discovering URLs from {current_url}: {e}")
+        async def find_links(current_url: str) -> List[str]:
+            async with semaphore:
+                try:
+                    page = await self._get_html(current_url)
+                    if page is None:
+                        return []
+                    links = []
+                    for href in extract_hrefs(*page):
+                        # Drop non-page links before paying for urljoin; the page URL
+                        # itself never holds these parts, so the joined URL can't gain them
+                        if not any(part in href for part in SKIP_URL_PARTS):
+                            links.append(urljoin(current_url, href))
+                    return links
+                except Exception as e:
+                    logger.error(f"Error discovering URLs from {current_url}: {e}")
+                    return []
         
+        # Crawl one depth level at a time, fetching the whole frontier concurrently
+        frontier = [start_url]
+        for depth in range(max_depth + 1):
+            if not frontier:
+                break
+            next_frontier = []
+            for links in await asyncio.gather(*(find_links(url) for url in frontier)):
+                for full_url in links:
+                    # Only include Amplify NextJS documentation URLs
+                    if full_url not in discovered_urls and full_url.startswith(self.base_url):
+                        discovered_urls.add(full_url)
+                        if depth < max_depth:
+                            next_frontier.append(full_url)
+            frontier = next_frontier
+        
+        # The start page was already visited rather than discovered
+        discovered_urls.discard(start_url)
         return list(discovered_urls)
     
     def save_markdown_file(self, doc_data: Dict[str, Any], output_dir: Path):
@@ -483,11 +984,12 @@ class AmplifyDocsScraper:
         try:
             # Create a safe filename from the URL
             url_path = urlparse(doc_data['url']).path
-            # Remove leading/trailing slashes and replace remaining with underscores
-            filename = url_path.strip('/').replace('/', '_')
+            # Remove leading/trailing slashes and replace remaining slashes and
+            # other unsafe characters with underscores
+            filename = url_path.strip('/').translate(MARKDOWN_FILENAME_TRANSLATION)
             if not filename:
                 filename = 'index'
-            filename = f"{filename}.md"
+            filename = f"{filename[:MARKDOWN_FILENAME_MAX_LENGTH]}.md"
             
             # Create category subdirectory
             category_dir = output_dir / doc_data['category']
@@ -516,16 +1018,16 @@ class AmplifyDocsScraper:
             logger.error(f"Error saving markdown file for {doc_data['url']}: {e}")
             return False
     
-    async def scrape_docs(self, force_refresh=False, save_markdown=False, markdown_dir="amplify_docs_markdown"):
-        """Scrape all documentation pages."""
-        db = AmplifyDocsDatabase()
+    async def scrape_docs(self, force_refresh=False, save_markdown=False, markdown_dir="amplify_docs_markdown",
+                          resume=False):
+        """Scrape all documentation pages; resume=True continues an interrupted scrape."""
+        db = get_db()
         
         # Check if we need to scrape
-        if not force_refresh:
-            stats = db.get_stats()
-            if stats.get('total_documents', 0) > 0:
-                logger.info(f"Documentation already indexed ({stats['total_documents']} documents). Use force_refresh=True to re-scrape.")
-                return
+        existing_documents = db.get_stats().get('total_documents', 0)
+        if not force_refresh and not resume and existing_documents > 0:
+            logger.info(f"Documentation already indexed ({existing_documents} documents). Use force_refresh=True to re-scrape.")
+            return
         
         # Set up markdown output directory if requested
         output_dir = None
@@ -542,23 +1044,58 @@ class AmplifyDocsScraper:
         
         logger.info(f"Found {len(discovered_urls)} URLs to scrape")
         
-        # Scrape each URL
-        for i, url in enumerate(discovered_urls, 1):
-            logger.info(f"Scraping {i}/{len(discovered_urls)}: {url}")
-            doc_data = await self.fetch_page(url)
-            if doc_data:
-                if db.save_document(doc_data):
-                    scraped_count += 1
-                    # Save as markdown if requested
-                    if save_markdown and output_dir:
-                        self.save_markdown_file(doc_data, output_dir)
-                else:
-                    errors += 1
+        # A forced refresh fetches every page; a resumed scrape skips recent ones.
+        # last_scraped holds local isoformat() strings, so an isoformat cutoff compares correctly
+        recent_urls = set()
+        if resume and not force_refresh:
+            recent_urls = db.get_urls_scraped_since((datetime.now() - SCRAPE_RESUME_MAX_AGE).isoformat())
+        if recent_urls:
+            pending_urls = [url for url in discovered_urls if url not in recent_urls]
+            logger.info(f"Resuming: skipping {len(discovered_urls) - len(pending_urls)} URLs scraped in the last {SCRAPE_RESUME_MAX_AGE.days} days")
+            discovered_urls = pending_urls
+        
+        # Fetch pages concurrently, bounded by a semaphore
+        semaphore = asyncio.Semaphore(SCRAPE_CONCURRENCY)
+        total = len(discovered_urls)
+        
+        async def fetch_one(i: int, url: str) -> Optional[Dict[str, Any]]:
+            async with semaphore:
+                logger.info(f"Scraping {i}/{total}: {url}")
+                return await self.fetch_page(url)
+        
+        async def save_batch(batch: List[Dict[str, Any]]):
+            nonlocal scraped_count, errors
+            if db.save_documents_bulk(batch):
+                scraped_count += len(batch)
+                # Save as markdown if requested, writing files on worker threads
+                # so the disk I/O doesn't hold up fetches still in flight
+                if save_markdown and output_dir:
+                    await asyncio.gather(*(
+                        asyncio.to_thread(self.save_markdown_file, doc_data, output_dir)
+                        for doc_data in batch
+                    ))
             else:
-                errors += 1
-            
-            # Small delay to be respectful
-            await asyncio.sleep(0.5)
+                errors += len(batch)
+        
+        # Save pages in batches as they arrive, one transaction per batch, so an
+        # interrupted scrape keeps what it already fetched. Only a full load,
+        # filling an empty database or rewriting every page, drops the secondary
+        # indexes while it runs; a resumed scrape saves its few pages with the
+        # indexes in place
+        batch = []
+        full_load = force_refresh or existing_documents == 0
+        with db.bulk_load() if full_load else nullcontext():
+            for next_page in asyncio.as_completed([fetch_one(i, url) for i, url in enumerate(discovered_urls, 1)]):
+                doc_data = await next_page
+                if not doc_data:
+                    errors += 1
+                    continue
+                batch.append(doc_data)
+                if len(batch) >= SCRAPE_SAVE_BATCH_SIZE:
+                    await save_batch(batch)
+                    batch = []
+            if batch:
+                await save_batch(batch)
         
         logger.info(f"Scraping completed! Processed {scraped_count} documents successfully, {errors} errors.")
         if save_markdown:
@@ -569,75 +1106,211 @@ class AmplifyDocsDatabase:
     
     def __init__(self, db_path: str = DB_PATH):
         self.db_path = db_path
+        # One connection per thread, opened on first use and then reused
+        self._local = threading.local()
+        # Table names, read from sqlite_master on first use; see refresh_schema()
+        self._tables: Optional[set] = None
+    
+    def _conn(self) -> sqlite3.Connection:
+        """Get this thread's connection, opening and configuring it on first use."""
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            # The schema is created on first use rather than at import
+            ensure_database(self.db_path)
+            # Autocommit mode: each statement commits on its own unless a
+            # caller opens an explicit transaction
+            conn = sqlite3.connect(self.db_path, check_same_thread=False, isolation_level=None)
+            for pragma in CONNECTION_PRAGMAS:
+                conn.execute(pragma)
+            self._local.conn = conn
+        return conn
+    
+    def close(self):
+        """Close this thread's connection, if it has one."""
+        conn = getattr(self._local, 'conn', None)
+        if conn is not None:
+            conn.close()
+            self._local.conn = None
+            self._local.search_cache = None
+    
+    def _search_cache(self) -> OrderedDict:
+        """Get this thread's search cache, emptied if the database changed since it was filled."""
+        # data_version moves whenever another connection, in this process or
+        # another one such as a CLI scrape, commits to the database
+        data_version = self._conn().execute("PRAGMA data_version").fetchone()[0]
+        cache = getattr(self._local, 'search_cache', None)
+        if cache is None or self._local.data_version != data_version:
+            cache = self._local.search_cache = OrderedDict()
+            self._local.data_version = data_version
+        return cache
+    
+    def _clear_search_cache(self):
+        """Drop this thread's cached searches after it writes; other threads see the new data_version."""
+        self._local.search_cache = None
+    
+    # Upsert rather than INSERT OR REPLACE: REPLACE deletes the old row without
+    # firing the delete trigger that keeps documents_fts in sync
+    UPSERT_DOCUMENT_SQL = """
+        INSERT INTO documents 
+        (url, title, content, markdown_content, category, last_scraped, code_blocks)
+        VALUES (?, ?, ?, ?, ?, ?, ?)
+        ON CONFLICT(url) DO UPDATE SET
+            title = excluded.title,
+            content = excluded.content,
+            markdown_content = excluded.markdown_content,
+            category = excluded.category,
+            last_scraped = excluded.last_scraped,
+            code_blocks = excluded.code_blocks
+    """
     
     def save_document(self, doc_data: Dict[str, Any]) -> bool:
         """Save a document to the database."""
         try:
-            conn = sqlite3.connect(self.db_path)
-            cursor = conn.cursor()
+            cursor = self._conn().cursor()
             
-            cursor.execute("""
-                INSERT OR REPLACE INTO documents 
-                (url, title, content, markdown_content, category, last_scraped)
-                VALUES (?, ?, ?, ?, ?, ?)
-            """, (
+            cursor.execute(self.UPSERT_DOCUMENT_SQL, (
                 doc_data['url'],
                 doc_data['title'],
                 doc_data['content'],
                 doc_data['markdown_content'],
                 doc_data['category'],
-                datetime.now().isoformat()
+                datetime.now().isoformat(),
+                extract_code_blocks(doc_data['markdown_content'])
             ))
             
-            conn.commit()
-            conn.close()
+            self._clear_search_cache()
             return True
             
         except Exception as e:
             logger.error(f"Error saving document: {e}")
             return False
     
-    def search_documents(self, query: str, category: Optional[str] = None, limit: int = 10) -> List[Dict[str, Any]]:
+    def save_documents_bulk(self, docs: List[Dict[str, Any]]) -> bool:
+        """Save many documents in a single transaction."""
+        scraped_at = datetime.now().isoformat()
+        rows = [
+            (doc['url'], doc['title'], doc['content'], doc['markdown_content'], doc['category'], scraped_at,
+             extract_code_blocks(doc['markdown_content']))
+            for doc in docs
+        ]
+        conn = self._conn()
+        try:
+            # One transaction means one journal sync for the whole batch
+            # instead of one per document
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                conn.executemany(self.UPSERT_DOCUMENT_SQL, rows)
+            except Exception:
+                conn.execute("ROLLBACK")
+                raise
+            conn.execute("COMMIT")
+            self._clear_search_cache()
+            return True
+            
+        except Exception as e:
+            logger.error(f"Error saving documents: {e}")
+            return False
+    
+    @contextmanager
+    def bulk_load(self):
+        """Drop secondary indexes for the duration of a bulk insert, then rebuild them."""
+        # Building each index once over the final rows is cheaper than
+        # updating it for every inserted row
+        conn = self._conn()
+        for index_name in SECONDARY_INDEXES:
+            conn.execute(f"DROP INDEX IF EXISTS {index_name}")
+        try:
+            yield self
+        finally:
+            for index_name, index_target in SECONDARY_INDEXES.items():
+                conn.execute(f"CREATE INDEX IF NOT EXISTS {index_name} ON {index_target}")
+    
+    def search_fts(self, match_query: str, category: Optional[str] = None, limit: int = 10,
+                   columns: Sequence[str] = SEARCH_RESULT_COLUMNS) -> Optional[List[Dict[str, Any]]]:
+        """Run an FTS5 MATCH expression against the full-text index, best bm25 matches first; None on error."""
+        try:
+            cursor = self._conn().cursor()
+            
+            # snippet() cuts a ~32 token excerpt around the matches in content.
+            # Search results leave out markdown_content unless asked for;
+            # get_document_by_url() returns it for a single page.
+            sql = f"""
+                SELECT {', '.join('d.' + column for column in columns)},
+                       -bm25(documents_fts, 10.0, 1.0, 5.0) as relevance_score,
+                       snippet(documents_fts, 1, '', '', '...', 32) as snippet
+                FROM documents_fts
+                JOIN documents d ON d.id = documents_fts.rowid
+                WHERE documents_fts MATCH ?
+            """
+            params = [match_query]
+            
+            if category:
+                sql += " AND d.category = ?"
+                params.append(category)
+            
+            sql += " ORDER BY relevance_score DESC, d.last_scraped DESC LIMIT ?"
+            params.append(limit)
+            
+            cursor.execute(sql, params)
+            
+            results = []
+            for row in cursor.fetchall():
+                doc = dict(zip(columns, row))
+                doc['relevance'] = row[-2]
+                doc['snippet'] = row[-1]
+                results.append(doc)
+            
+            return results
+            
+        except Exception as e:
+            logger.error(f"Error running full-text search: {e}")
+            return None
+    
+    def search_documents(self, query: str, category: Optional[str] = None, limit: int = 10,
+                         match_query: Optional[str] = None,
+                         columns: Sequence[str] = SEARCH_RESULT_COLUMNS) -> List[Dict[str, Any]]:
         """Enhanced search with fuzzy matching and better relevance scoring."""
+        # Results always carry url; callers that don't read content can leave it out
+        columns = tuple(dict.fromkeys(('url', *columns)))
+        unknown = set(columns) - SEARCH_COLUMN_CHOICES
+        if unknown:
+            raise ValueError(f"Unknown search columns: {', '.join(sorted(unknown))}")
+        cache = self._search_cache()
+        key = (query, category, limit, match_query, columns)
+        results = cache.get(key)
+        if results is None:
+            results = self._search_documents(query, category, limit, match_query, columns)
+            # A failed search (a locked database, an I/O error) is retried next
+            # time rather than remembered as having no results
+            if results is None:
+                return []
+            cache[key] = results
+            if len(cache) > SEARCH_CACHE_SIZE:
+                cache.popitem(last=False)
+        else:
+            cache.move_to_end(key)
+        # Callers get their own dicts, so changing a result can't change the cache
+        return [dict(doc) for doc in results]
+    
+    def _search_documents(self, query: str, category: Optional[str], limit: int,
+                          match_query: Optional[str], columns: Tuple[str, ...]) -> Optional[List[Dict[str, Any]]]:
+        """Run a search against the database, without the result cache; None on error."""
         try:
-            conn = sqlite3.connect(self.db_path)
-            cursor = conn.cursor()
+            # A prebuilt FTS5 expression skips query expansion; query itself is
+            # still used by the LIKE fallback when there is no full-text index
+            if match_query and self._table_exists('documents_fts'):
+                return self.search_fts(match_query, category, limit, columns)
+            
+            cursor = self._conn().cursor()
             
             # Normalize query
             query_lower = query.lower()
             query_words = query_lower.split()
             
-            # Common synonyms and variations - updated for Amplify Gen 2
-            synonyms = {
-                "auth": ["authentication", "auth", "signin", "signup", "login", "cognito", "authenticator"],
-                "api": ["api", "rest", "http", "endpoint", "apigateway", "custom"],
-                "data": ["data", "defineData", "model", "schema", "real-time", "subscription", "generateClient", "observeQuery"],
-                "graphql": ["graphql", "query", "mutation", "subscription"],
-                "ui": ["ui", "component", "frontend", "interface", "view", "crud", "form", "authenticator", "fileuploader"],
-                "storage": ["storage", "s3", "file", "upload", "download", "fileuploader", "uploadData", "downloadData"],
-                "db": ["database", "dynamodb", "table", "defineData", "model", "schema"],
-                "deploy": ["deploy", "deployment", "hosting", "publish", "amplify", "sandbox", "npx"],
-                "definedata": ["defineData", "data", "model", "schema", "backend"],
-                "realtime": ["real-time", "realtime", "subscription", "observeQuery", "live"],
-                "typescript": ["typescript", "types", "type-safe", "generateClient"]
-            }
-            
-            # Add common typos/variations
-            typo_fixes = {
-                "authentcation": "authentication",
-                "authentiction": "authentication", 
-                "authenitcation": "authentication",
-                "storag": "storage",
-                "graphq": "graphql",
-                "deply": "deploy",
-                "uplod": "upload",
-                "dowload": "download"
-            }
-            
             # Fix typos in query words
             corrected_words = []
             for word in query_words:
-                corrected_words.append(typo_fixes.get(word, word))
+                corrected_words.append(SEARCH_TYPO_FIXES.get(word, word))
             
             # Use corrected words if any typos were fixed
             if corrected_words != query_words:
@@ -646,8 +1319,8 @@ class AmplifyDocsDatabase:
             # Handle empty query
             if not query_words:
                 # Return all documents for empty query
-                sql = """
-                    SELECT url, title, content, markdown_content, category, last_scraped, 1 as relevance_score
+                sql = f"""
+                    SELECT {', '.join(columns)}, 1 as relevance_score
                     FROM documents
                 """
                 params = []
@@ -663,69 +1336,81 @@ class AmplifyDocsDatabase:
                 
                 results = []
                 for row in cursor.fetchall():
-                    results.append({
-                        'url': row[0],
-                        'title': row[1],
-                        'content': row[2],
-                        'markdown_content': row[3],
-                        'category': row[4],
-                        'last_scraped': row[5],
-                        'relevance': row[6]
-                    })
+                    doc = dict(zip(columns, row))
+                    doc['relevance'] = row[-1]
+                    results.append(doc)
                 
-                conn.close()
                 return results
             
             # Expand query with synonyms
             expanded_words = set(query_words)
             for word in query_words:
-                for key, values in synonyms.items():
-                    if word in values or key == word:
-                        expanded_words.update(values)
+                expanded_words.update(SYNONYM_EXPANSIONS.get(word, ()))
+            
+            # Use the full-text index when it exists: MATCH reads posting lists
+            # instead of scanning every row, and bm25() weights title and URL
+            # hits above body hits
+            if self._table_exists('documents_fts'):
+                match_query = build_fts_query(expanded_words)
+                if not match_query:
+                    return []
+                
+                return self.search_fts(match_query, category, limit, columns)
             
             # Build SQL with scoring
             conditions = []
             params = []
             
-            # Create scoring SQL
+            # Create scoring SQL. Search terms are bound as parameters rather than
+            # spliced into the text, so quotes in a query can't break the statement
+            # and queries of the same shape reuse sqlite3's cached statement.
+            # Columns aren't wrapped in LOWER(): LIKE already ignores ASCII case,
+            # the only case LOWER() folds, and LOWER(d.content) copied every
+            # page's text once per search word.
             score_cases = []
+            score_params = []
             
             # Exact match in title (highest score)
             if query_lower:
-                score_cases.append(f"WHEN LOWER(d.title) LIKE '%{query_lower}%' THEN 100")
-                score_cases.append(f"WHEN LOWER(d.url) LIKE '%{query_lower}%' THEN 80")
+                score_cases.append("WHEN d.title LIKE ? THEN 100")
+                score_cases.append("WHEN d.url LIKE ? THEN 80")
+                score_params.extend([f"%{query_lower}%", f"%{query_lower}%"])
             
             # Special scoring for Amplify Data queries
             if any(term in query_lower for term in ['definedata', 'a.model', 'schema', 'real-time', 'generateclient']):
-                score_cases.append(f"WHEN d.category = 'api-data' THEN 90")
-                score_cases.append(f"WHEN LOWER(d.url) LIKE '%/data/%' THEN 85")
-                score_cases.append(f"WHEN LOWER(d.title) LIKE '%data%' THEN 75")
+                score_cases.append("WHEN d.category = 'api-data' THEN 90")
+                score_cases.append("WHEN d.url LIKE '%/data/%' THEN 85")
+                score_cases.append("WHEN d.title LIKE '%data%' THEN 75")
             
             # Word matches in title
             for word in query_words:
-                score_cases.append(f"WHEN LOWER(d.title) LIKE '%{word}%' THEN 50")
+                score_cases.append("WHEN d.title LIKE ? THEN 50")
+                score_params.append(f"%{word}%")
             
             # Expanded word matches
             for word in expanded_words:
-                conditions.append("(LOWER(d.title) LIKE ? OR LOWER(d.content) LIKE ? OR LOWER(d.url) LIKE ?)")
+                conditions.append("(d.title LIKE ? OR d.content LIKE ? OR d.url LIKE ?)")
                 params.extend([f"%{word}%", f"%{word}%", f"%{word}%"])
-                score_cases.append(f"WHEN LOWER(d.title) LIKE '%{word}%' THEN 30")
-                score_cases.append(f"WHEN LOWER(d.content) LIKE '%{word}%' THEN 10")
+                score_cases.append("WHEN d.title LIKE ? THEN 30")
+                score_cases.append("WHEN d.content LIKE ? THEN 10")
+                score_params.extend([f"%{word}%", f"%{word}%"])
             
             # Build the query
             score_sql = "CASE " + " ".join(score_cases) + " ELSE 1 END"
+            select_sql = ', '.join('d.' + column for column in columns)
             
             # Check if we have summaries table for better results
             if self._table_exists('document_summaries'):
                 sql = f"""
-                    SELECT DISTINCT d.url, d.title, d.content, d.markdown_content, d.category, d.last_scraped,
+                    SELECT DISTINCT {select_sql},
                            ({score_sql}) + 
                            (CASE WHEN s.summary LIKE ? THEN 20 ELSE 0 END) as relevance_score
                     FROM documents d
                     LEFT JOIN document_summaries s ON d.url = s.url
                     WHERE {' OR '.join(conditions)}
                 """
-                params.append(f"%{query_lower}%")
+                # The summary LIKE sits in the SELECT list, after the score cases
+                params = score_params + [f"%{query_lower}%"] + params
                 
                 if category:
                     sql += " AND d.category = ?"
@@ -733,17 +1418,18 @@ class AmplifyDocsDatabase:
             else:
                 # Simple query without join - need to use table alias
                 sql = f"""
-                    SELECT DISTINCT d.url, d.title, d.content, d.markdown_content, d.category, d.last_scraped,
+                    SELECT DISTINCT {select_sql},
                            ({score_sql}) as relevance_score
                     FROM documents d
                     WHERE {' OR '.join(conditions)}
                 """
+                params = score_params + params
                 
                 if category:
                     sql += " AND d.category = ?"
                     params.append(category)
             
-            sql += " ORDER BY relevance_score DESC, last_scraped DESC LIMIT ?"
+            sql += " ORDER BY relevance_score DESC, d.last_scraped DESC LIMIT ?"
             params.append(limit * 2)  # Get more results for filtering
             
             cursor.execute(sql, params)
@@ -756,60 +1442,62 @@ class AmplifyDocsDatabase:
                 url = row[0]
                 if url not in seen_urls and len(results) < limit:
                     seen_urls.add(url)
-                    results.append({
-                        'url': url,
-                        'title': row[1],
-                        'content': row[2],
-                        'markdown_content': row[3],
-                        'category': row[4],
-                        'last_scraped': row[5],
-                        'relevance': row[6] if len(row) > 6 else 0
-                    })
+                    doc = dict(zip(columns, row))
+                    doc['relevance'] = row[-1]
+                    results.append(doc)
             
-            conn.close()
             return results
             
         except Exception as e:
             logger.error(f"Error searching documents: {e}")
-            return []
+            return None
     
     def _table_exists(self, table_name: str) -> bool:
         """Check if a table exists in the database."""
+        if self._tables is None:
+            try:
+                cursor = self._conn().cursor()
+                cursor.execute("SELECT name FROM sqlite_master WHERE type='table'")
+                self._tables = {row[0] for row in cursor.fetchall()}
+            except:
+                return False
+        return table_name in self._tables
+    
+    def refresh_schema(self):
+        """Forget the cached table list; call after creating or dropping tables."""
+        self._tables = None
+    
+    def get_urls_scraped_since(self, cutoff: str) -> set:
+        """Get the URLs of documents scraped after an ISO timestamp."""
         try:
-            conn = sqlite3.connect(self.db_path)
-            cursor = conn.cursor()
-            cursor.execute("""
-                SELECT name FROM sqlite_master 
-                WHERE type='table' AND name=?
-            """, (table_name,))
-            result = cursor.fetchone()
-            conn.close()
-            return result is not None
-        except:
-            return False
+            cursor = self._conn().cursor()
+            cursor.execute("SELECT url FROM documents WHERE last_scraped > ?", (cutoff,))
+            return {row[0] for row in cursor.fetchall()}
+        except Exception as e:
+            logger.error(f"Error getting recently scraped URLs: {e}")
+            return set()
     
     def get_document_by_url(self, url: str) -> Optional[Dict[str, Any]]:
         """Get a specific document by URL."""
         try:
-            conn = sqlite3.connect(self.db_path)
-            cursor = conn.cursor()
+            cursor = self._conn().cursor()
             
+            # Callers show the markdown, so the plain-text copy in content is
+            # left out; last_scraped comes back as the stored ISO string
             cursor.execute("""
-                SELECT url, title, content, markdown_content, category, last_scraped
+                SELECT url, title, markdown_content, category, last_scraped
                 FROM documents WHERE url = ?
             """, (url,))
             
             row = cursor.fetchone()
-            conn.close()
             
             if row:
                 return {
                     'url': row[0],
                     'title': row[1],
-                    'content': row[2],
-                    'markdown_content': row[3],
-                    'category': row[4],
-                    'last_scraped': row[5]
+                    'markdown_content': row[2],
+                    'category': row[3],
+                    'last_scraped': row[4]
                 }
             return None
             
@@ -820,13 +1508,11 @@ class AmplifyDocsDatabase:
     def list_categories(self) -> List[str]:
         """List all available categories."""
         try:
-            conn = sqlite3.connect(self.db_path)
-            cursor = conn.cursor()
+            cursor = self._conn().cursor()
             
             cursor.execute("SELECT DISTINCT category FROM documents ORDER BY category")
             categories = [row[0] for row in cursor.fetchall()]
             
-            conn.close()
             return categories
             
         except Exception as e:
@@ -836,31 +1522,23 @@ class AmplifyDocsDatabase:
     def get_stats(self) -> Dict[str, Any]:
         """Get database statistics."""
         try:
-            conn = sqlite3.connect(self.db_path)
-            cursor = conn.cursor()
-            
-            cursor.execute("SELECT COUNT(*) FROM documents")
-            total_docs = cursor.fetchone()[0]
+            cursor = self._conn().cursor()
             
+            # One grouped scan yields the per-category counts and latest scrape
+            # times; the totals are folded from those rows
             cursor.execute("""
-                SELECT category, COUNT(*) 
+                SELECT category, COUNT(*), MAX(last_scraped)
                 FROM documents 
                 GROUP BY category 
                 ORDER BY COUNT(*) DESC
             """)
-            category_counts = dict(cursor.fetchall())
-            
-            cursor.execute("""
-                SELECT MAX(last_scraped) FROM documents
-            """)
-            last_update = cursor.fetchone()[0]
-            
-            conn.close()
+            rows = cursor.fetchall()
+            scraped_times = [last_scraped for _, _, last_scraped in rows if last_scraped is not None]
             
             return {
-                'total_documents': total_docs,
-                'categories': category_counts,
-                'last_update': last_update
+                'total_documents': sum(count for _, count, _ in rows),
+                'categories': {category: count for category, count, _ in rows},
+                'last_update': max(scraped_times) if scraped_times else None
             }
             
         except Exception as e:
@@ -870,9 +1548,8 @@ class AmplifyDocsDatabase:
     def get_all_documents(self) -> List[Dict[str, Any]]:
         """Get all documents from the database."""
         try:
-            conn = sqlite3.connect(self.db_path)
-            conn.row_factory = sqlite3.Row
-            cursor = conn.cursor()
+            cursor = self._conn().cursor()
+            cursor.row_factory = sqlite3.Row
             
             cursor.execute("""
                 SELECT url, title, content, markdown_content, category, last_scraped
@@ -884,13 +1561,13 @@ class AmplifyDocsDatabase:
             for row in cursor.fetchall():
                 documents.append(dict(row))
             
-            conn.close()
             return documents
             
         except Exception as e:
             logger.error(f"Error getting all documents: {e}")
             return []
 
+@functools.lru_cache(maxsize=1)
 def get_version_compatibility():
     """Get Amplify Gen 2 and Next.js version compatibility information."""
     return {
@@ -909,8 +1586,99 @@ def get_version_compatibility():
         "WARNING": "NEVER use npx create-amplify@latest --template nextjs - it does NOT exist!"
     }
 
-# Initialize database
-init_database()
+@functools.lru_cache(maxsize=1)
+def load_documentation_index(path: str, mtime: float) -> Dict[str, Any]:
+    """Load a documentation index file; callers pass its mtime so edits reload it."""
+    if orjson is not None:
+        return orjson.loads(Path(path).read_bytes())
+    with open(path, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+@functools.lru_cache(maxsize=4)
+def build_documentation_overview(format_type: str, path: str, mtime: float) -> str:
+    """Render the getDocumentationOverview text for an index file; a new mtime rebuilds it."""
+    index = load_documentation_index(path, mtime)
+    if format_type == "full":
+        return validate_response(index["overview"])
+    else:
+        parts = ["""# Amplify Gen 2 Documentation Summary
+
+## Quick Access Commands
+- Create new app: `npx create-next-app@14.2.10 your-app-name --typescript --app --tailwind --eslint`
+- Install Amplify: `npm install aws-amplify@^6.6.0 @aws-amplify/ui-react@^6.5.0`
+- Search docs: Use searchDocs tool with your query
+- Get patterns: Use findPatterns tool with pattern type
+- **Field Types Reference**: `quickHelp({task: "data-field-types"})`
+
+## Key Data Field Types
+- Basic: `a.string()`, `a.integer()`, `a.float()`, `a.boolean()`, `a.date()`
+- Validated: `a.email()`, `a.phone()`, `a.url()`, `a.ipAddress()` ✅
+- Arrays: Any type + `.array()` (e.g., `a.string().array()`)
+- Complex: `a.json()` for nested objects
+
+## Main Categories
+"""]
+        for cat_id, cat_data in index["categories"].items():
+            parts.append(f"\n**{cat_data['title']}** ({cat_data['doc_count']} docs)\n")
+            parts.append(f"{cat_data['summary'][:150]}...\n")
+        
+        parts.append("\n## Common Patterns Available\n")
+        patterns = ["auth", "api", "storage", "data", "deployment"]
+        parts.append("- " + "\n- ".join(patterns))
+        
+        parts.append("\n\n💡 Use getDocumentationOverview with format='full' for detailed information.")
+        
+        return validate_response("".join(parts))
+
+@functools.lru_cache(maxsize=None)
+def get_db() -> AmplifyDocsDatabase:
+    """Get the process-wide database, so callers share one warm connection per thread."""
+    return AmplifyDocsDatabase()
+
+# findPatterns search queries for different patterns - aligned with Amplify Gen 2 architecture
+PATTERN_QUERIES = {
+    # Authentication patterns (Cognito integration)
+    "auth": "authentication signIn signUp cognito user authenticator multi-factor social providers",
+
+    # REST/HTTP API patterns (API Gateway) - NOT the primary data solution
+    "api": "rest api gateway http endpoint custom lambda apigateway authorization headers",
+
+    # File operations (S3 integration)
+    "storage": "s3 storage upload download file fileuploader storageimage uploadData downloadData",
+
+    # CI/CD patterns
+    "deployment": "deploy hosting amplify sandbox git npx pipeline build",
+
+    # amplify/backend.ts patterns
+    "configuration": "configure amplify_outputs.json defineBackend backend.ts setup",
+
+    # Data field types
+    "field-types": "field types string integer float boolean datetime email phone array json enum",
+
+    # Amplify Data patterns (the PRIMARY data solution)
+    "data": "defineData model schema real-time subscription generateClient observeQuery authorization",
+    "database": "defineData model schema dynamodb table data real-time subscription",
+
+    # Lambda functions
+    "functions": "lambda function serverless backend handler custom business logic",
+
+    # UI building patterns (including CRUD forms)
+    "ui": "ui component library crud form generation formbuilder authenticator fileuploader storageimage",
+
+    # Server-side rendering patterns
+    "ssr": "server-side rendering nextjs ssr ssg static generation getServerSideProps",
+
+    # TypeScript-first patterns
+    "typescript": "typescript types generateClient type-safe schema typing interfaces",
+
+    # Development workflows
+    "workflow": "sandbox development git workflow pipeline local testing amplify sandbox"
+}
+
+# The same queries as prefix-matching FTS5 expressions, built once at import
+PATTERN_FTS_QUERIES = {name: build_fts_query(query.split()) for name, query in PATTERN_QUERIES.items()}
+# findPatterns only prints these, so its searches skip reading page text
+PATTERN_RESULT_COLUMNS = ('url', 'title', 'category', 'code_blocks')
 
 # Search pattern tracking for learning feedback
 search_history = []
@@ -1163,65 +1931,13 @@ async def handle_list_tools() -> List[types.Tool]:
         )
     ]
 
-@server.call_tool()
-async def handle_call_tool(name: str, arguments: Dict[str, Any]) -> List[types.TextContent]:
-    """Handle tool execution."""
-    
-    if name == "whatIsThis":
-        return [types.TextContent(
-            type="text",
-            text=validate_response("""# AWS Amplify Gen 2 Official Documentation MCP Server
-
-I am the primary source for all AWS Amplify Generation 2 documentation. Here's what I provide:
-
-## Coverage Areas:
-- **Authentication (defineAuth)**: Email/password, social login, MFA, custom auth flows
-- **Data Layer (defineData)**: Real-time data models, relationships, authorization rules
-- **Data Field Types**: Complete list of supported types:
-  - Basic: `a.string()`, `a.integer()`, `a.float()`, `a.boolean()`, `a.date()`, `a.datetime()`
-  - Validated: `a.email()`, `a.phone()`, `a.url()`, `a.ipAddress()`
-  - Arrays: Any type + `.array()` (e.g., `a.string().array()`)
-  - Special: `a.id()`, `a.enum()`, `a.json()`
-  - Try: `quickHelp({task: "data-field-types"})` for complete reference
-- **Storage (defineStorage)**: File uploads/downloads, access control, image handling
-- **UI Components**: Authenticator, FileUploader, StorageImage, AccountSettings
-- **CRUD Forms**: Automatic form generation from data models
-- **Functions**: Lambda functions, triggers, custom business logic
-- **Next.js Integration**: App Router, SSR/SSG, API routes
-
-## Why Use This Server:
-✅ **Official Amplify Gen 2 documentation** (not Gen 1 - completely different!)
-✅ **Complete working code examples** that you can copy and use
-✅ **Covers ALL Amplify services** with real-world patterns
-✅ **Up-to-date with latest features** including CRUD form generation
-✅ **Categorized content** for easy navigation
-
-## Quick Start:
-- For general questions: `searchDocs({query: "your question"})`
-- For instant help: `quickHelp({task: "setup-email-auth"})`
-- For patterns: `findPatterns({pattern_type: "auth"})`
-- For full docs: `getDocument({url: "specific-doc-url"})`
-
-## Common Questions I Answer:
-- How to set up authentication with email/social login
-- Creating real-time data models with relationships
-- What field types are available (string, email, phone, arrays, etc.)
-- Implementing file uploads with access control
-- Generating CRUD forms automatically
-- Deploying to AWS with custom domains
-
-Try me with any Amplify Gen 2 question!""")
-        )]
-    
-    elif name == "quickHelp":
-        task = arguments.get("task")
-        
-        guides = {
-            "setup-email-auth": {
-                "title": "Email Authentication Setup",
-                "answer": "Email is the default auth method in Amplify Gen 2. Just use defineAuth with email: true",
-                "code": """// amplify/auth/resource.ts
-import { defineAuth } from '@aws-amplify/backend';
+# quickHelp answers by task, built once at import
+QUICK_HELP_GUIDES = {
+    "setup-email-auth": {
+        "title": "Email Authentication Setup",
+        "answer": "Email is the default auth method in Amplify Gen 2. Just use defineAuth with email: true",
+        "code": """// amplify/auth/resource.ts
+import { defineAuth } from '@aws-amplify/backend';
 
 export const auth = defineAuth({
   loginWith: {
@@ -1253,12 +1969,12 @@ export default function App() {
     </Authenticator>
   );
 }""",
-                "nextSteps": "1. Run 'npx ampx sandbox' to deploy\n2. The Authenticator component handles all UI\n3. Add signUpAttributes for additional fields"
-            },
-            "create-data-model": {
-                "title": "Data Model Creation",
-                "answer": "Define your data model using a.model() in a TypeScript schema",
-                "code": """// amplify/data/resource.ts
+        "nextSteps": "1. Run 'npx ampx sandbox' to deploy\n2. The Authenticator component handles all UI\n3. Add signUpAttributes for additional fields"
+    },
+    "create-data-model": {
+        "title": "Data Model Creation",
+        "answer": "Define your data model using a.model() in a TypeScript schema",
+        "code": """// amplify/data/resource.ts
 import { a, defineData, type ClientSchema } from '@aws-amplify/backend';
 
 const schema = a.schema({
@@ -1298,12 +2014,12 @@ const { data: todo } = await client.models.Todo.create({
 const sub = client.models.Todo.observeQuery().subscribe({
   next: ({ items }) => console.log(items)
 });""",
-                "nextSteps": "1. Run 'npx ampx sandbox' to generate the API\n2. Use generateClient<Schema>() for type-safe operations\n3. Add relationships with a.belongsTo() and a.hasMany()"
-            },
-            "data-field-types": {
-                "title": "Data Field Types Reference",
-                "answer": "Complete guide to all supported field types in Amplify Gen 2 data models",
-                "code": """// amplify/data/resource.ts
+        "nextSteps": "1. Run 'npx ampx sandbox' to generate the API\n2. Use generateClient<Schema>() for type-safe operations\n3. Add relationships with a.belongsTo() and a.hasMany()"
+    },
+    "data-field-types": {
+        "title": "Data Field Types Reference",
+        "answer": "Complete guide to all supported field types in Amplify Gen 2 data models",
+        "code": """// amplify/data/resource.ts
 import { a, defineData, type ClientSchema } from '@aws-amplify/backend';
 
 const schema = a.schema({
@@ -1356,12 +2072,12 @@ const data = {
   stringArray: ['tag1', 'tag2', 'tag3'],
   integerArray: [1, 2, 3, 4, 5]
 };""",
-                "nextSteps": "1. Use a.email() and a.phone() for validated fields\n2. Use .array() for arrays instead of JSON workarounds\n3. Use a.json() for complex nested objects\n4. See https://docs.amplify.aws/nextjs/build-a-backend/data/data-modeling/add-fields/"
-            },
-            "add-file-upload": {
-                "title": "File Upload Implementation",
-                "answer": "Use FileUploader component for the UI and defineStorage for backend",
-                "code": """// amplify/storage/resource.ts
+        "nextSteps": "1. Use a.email() and a.phone() for validated fields\n2. Use .array() for arrays instead of JSON workarounds\n3. Use a.json() for complex nested objects\n4. See https://docs.amplify.aws/nextjs/build-a-backend/data/data-modeling/add-fields/"
+    },
+    "add-file-upload": {
+        "title": "File Upload Implementation",
+        "answer": "Use FileUploader component for the UI and defineStorage for backend",
+        "code": """// amplify/storage/resource.ts
 import { defineStorage } from '@aws-amplify/backend';
 
 export const storage = defineStorage({
@@ -1410,12 +2126,12 @@ async function uploadFile(file: File) {
   
   return result.path;
 }""",
-                "nextSteps": "1. Configure storage paths in defineStorage\n2. Use FileUploader for UI or uploadData for programmatic uploads\n3. Display with StorageImage component"
-            },
-            "generate-crud-forms": {
-                "title": "CRUD Form Generation", 
-                "answer": "Generate forms automatically from your data models",
-                "code": """// First, ensure you have a data model
+        "nextSteps": "1. Configure storage paths in defineStorage\n2. Use FileUploader for UI or uploadData for programmatic uploads\n3. Display with StorageImage component"
+    },
+    "generate-crud-forms": {
+        "title": "CRUD Form Generation", 
+        "answer": "Generate forms automatically from your data models",
+        "code": """// First, ensure you have a data model
 // amplify/data/resource.ts
 const schema = a.schema({
   Product: a.model({
@@ -1472,12 +2188,12 @@ export function EditProduct({ product }) {
     />
   );
 }""",
-                "nextSteps": "1. Run 'npx ampx generate forms' after defining models\n2. Import forms from '@/ui-components'\n3. Customize with overrides prop\n4. Re-generate when model changes"
-            },
-            "add-social-login": {
-                "title": "Social Login Setup",
-                "answer": "Add Google, Facebook, or other social providers to defineAuth",
-                "code": """// amplify/auth/resource.ts
+        "nextSteps": "1. Run 'npx ampx generate forms' after defining models\n2. Import forms from '@/ui-components'\n3. Customize with overrides prop\n4. Re-generate when model changes"
+    },
+    "add-social-login": {
+        "title": "Social Login Setup",
+        "answer": "Add Google, Facebook, or other social providers to defineAuth",
+        "code": """// amplify/auth/resource.ts
 import { defineAuth } from '@aws-amplify/backend';
 
 export const auth = defineAuth({
@@ -1521,12 +2237,12 @@ import { signInWithRedirect } from 'aws-amplify/auth';
 <button onClick={() => signInWithRedirect({ provider: 'Facebook' })}>
   Sign in with Facebook
 </button>""",
-                "nextSteps": "1. Register OAuth apps with providers\n2. Set secrets with 'npx ampx secret set'\n3. Add callback URLs to OAuth app settings\n4. The Authenticator component supports social login automatically"
-            },
-            "real-time-subscriptions": {
-                "title": "Real-time Data Subscriptions",
-                "answer": "Use observeQuery() for real-time data synchronization",
-                "code": """// Define a model with auth rules
+        "nextSteps": "1. Register OAuth apps with providers\n2. Set secrets with 'npx ampx secret set'\n3. Add callback URLs to OAuth app settings\n4. The Authenticator component supports social login automatically"
+    },
+    "real-time-subscriptions": {
+        "title": "Real-time Data Subscriptions",
+        "answer": "Use observeQuery() for real-time data synchronization",
+        "code": """// Define a model with auth rules
 const schema = a.schema({
   Message: a.model({
     content: a.string().required(),
@@ -1588,12 +2304,12 @@ export function ChatRoom({ roomId }: { roomId: string }) {
     </div>
   );
 }""",
-                "nextSteps": "1. observeQuery() syncs data in real-time\n2. Filter subscriptions with query parameters\n3. Handle isSynced for loading states\n4. Unsubscribe in cleanup to prevent memory leaks"
-            },
-            "deploy-to-aws": {
-                "title": "Deploy to AWS",
-                "answer": "Deploy your app using Amplify Hosting with Git integration",
-                "code": """# 1. First, deploy your backend
+        "nextSteps": "1. observeQuery() syncs data in real-time\n2. Filter subscriptions with query parameters\n3. Handle isSynced for loading states\n4. Unsubscribe in cleanup to prevent memory leaks"
+    },
+    "deploy-to-aws": {
+        "title": "Deploy to AWS",
+        "answer": "Deploy your app using Amplify Hosting with Git integration",
+        "code": """# 1. First, deploy your backend
 npx ampx pipeline-deploy --branch main --app-id YOUR_APP_ID
 
 # 2. For full-stack deployment with hosting:
@@ -1634,12 +2350,12 @@ const myApiKey = secret('MY_API_KEY');
 
 # 5. Preview deployments
 # Every PR gets a preview URL automatically""",
-                "nextSteps": "1. Connect Git repository for automatic deployments\n2. Set environment variables in Amplify Console\n3. Configure custom domain\n4. Enable preview deployments for PRs"
-            },
-            "custom-auth-flow": {
-                "title": "Custom Authentication Flow",
-                "answer": "Implement custom auth challenges with Lambda triggers",
-                "code": """// amplify/auth/resource.ts
+        "nextSteps": "1. Connect Git repository for automatic deployments\n2. Set environment variables in Amplify Console\n3. Configure custom domain\n4. Enable preview deployments for PRs"
+    },
+    "custom-auth-flow": {
+        "title": "Custom Authentication Flow",
+        "answer": "Implement custom auth challenges with Lambda triggers",
+        "code": """// amplify/auth/resource.ts
 import { defineAuth } from '@aws-amplify/backend';
 import { defineFunction } from '@aws-amplify/backend';
 
@@ -1705,12 +2421,12 @@ if (nextStep.signInStep === 'CONFIRM_CUSTOM_CHALLENGE') {
     challengeResponse: code
   });
 }""",
-                "nextSteps": "1. Implement Lambda triggers for custom logic\n2. Use DynamoDB or Parameter Store for state\n3. Handle multiple challenge rounds if needed\n4. Test with different auth scenarios"
-            },
-            "advanced-real-time": {
-                "title": "Advanced Real-time Patterns with observeQuery",
-                "answer": "Comprehensive real-time subscription patterns with filtering, error handling, and connection management",
-                "code": """// Advanced observeQuery with filtering and pagination
+        "nextSteps": "1. Implement Lambda triggers for custom logic\n2. Use DynamoDB or Parameter Store for state\n3. Handle multiple challenge rounds if needed\n4. Test with different auth scenarios"
+    },
+    "advanced-real-time": {
+        "title": "Advanced Real-time Patterns with observeQuery",
+        "answer": "Comprehensive real-time subscription patterns with filtering, error handling, and connection management",
+        "code": """// Advanced observeQuery with filtering and pagination
 import { generateClient } from 'aws-amplify/data';
 import { ConnectionState } from '@aws-amplify/datastore';
 
@@ -1870,12 +2586,12 @@ export function usePaginatedRealTime(pageSize = 20) {
 
   return { items, loadMore, hasMore };
 }""",
-                "nextSteps": "1. Implement connection state monitoring with Hub\n2. Add retry logic for failed subscriptions\n3. Handle offline scenarios with DataStore\n4. Optimize with selective sync for large datasets"
-            },
-            "error-handling-patterns": {
-                "title": "Comprehensive Error Handling Patterns",
-                "answer": "Robust error handling for all Amplify operations with retry logic and user feedback",
-                "code": """// Error handling utilities and patterns
+        "nextSteps": "1. Implement connection state monitoring with Hub\n2. Add retry logic for failed subscriptions\n3. Handle offline scenarios with DataStore\n4. Optimize with selective sync for large datasets"
+    },
+    "error-handling-patterns": {
+        "title": "Comprehensive Error Handling Patterns",
+        "answer": "Robust error handling for all Amplify operations with retry logic and user feedback",
+        "code": """// Error handling utilities and patterns
 import { GraphQLError } from 'graphql';
 
 // 1. Error types and utilities
@@ -2068,12 +2784,12 @@ export function TodoManager() {
     </ErrorBoundary>
   );
 }""",
-                "nextSteps": "1. Integrate with error monitoring service (Sentry, etc.)\n2. Add toast notifications for user feedback\n3. Implement offline queue for failed mutations\n4. Create custom error pages for different error types"
-            },
-            "custom-auth-rules": {
-                "title": "Advanced Custom Authorization Rules",
-                "answer": "Complex authorization patterns including multi-tenant, role-based, and dynamic permissions",
-                "code": """// Advanced authorization patterns
+        "nextSteps": "1. Integrate with error monitoring service (Sentry, etc.)\n2. Add toast notifications for user feedback\n3. Implement offline queue for failed mutations\n4. Create custom error pages for different error types"
+    },
+    "custom-auth-rules": {
+        "title": "Advanced Custom Authorization Rules",
+        "answer": "Complex authorization patterns including multi-tenant, role-based, and dynamic permissions",
+        "code": """// Advanced authorization patterns
 import { a, defineData, type ClientSchema } from '@aws-amplify/backend';
 
 // 1. Group-based access control
@@ -2282,12 +2998,12 @@ export const timeBasedAuth = async (event: any) => {
   
   return { isAuthorized: true };
 };""",
-                "nextSteps": "1. Implement caching for authorization checks\n2. Add audit logging for all auth decisions\n3. Create permission management UI\n4. Set up auth testing framework"
-            },
-            "optimistic-ui-updates": {
-                "title": "Optimistic UI Update Patterns",
-                "answer": "Implement instant UI feedback with proper rollback handling",
-                "code": """// Optimistic UI patterns for Amplify Data
+        "nextSteps": "1. Implement caching for authorization checks\n2. Add audit logging for all auth decisions\n3. Create permission management UI\n4. Set up auth testing framework"
+    },
+    "optimistic-ui-updates": {
+        "title": "Optimistic UI Update Patterns",
+        "answer": "Implement instant UI feedback with proper rollback handling",
+        "code": """// Optimistic UI patterns for Amplify Data
 import { generateClient } from 'aws-amplify/data';
 import { useOptimistic } from 'react';
 
@@ -2620,12 +3336,12 @@ export function useOptimisticWithConflictResolution<T>() {
 
   return { conflicts, handleConflict };
 }""",
-                "nextSteps": "1. Add undo/redo functionality\n2. Implement offline queue for failed operations\n3. Create conflict resolution UI\n4. Add operation batching for performance"
-            },
-            "advanced-form-customization": {
-                "title": "Advanced Form Customization Patterns",
-                "answer": "Extensive form customization including validation, conditional fields, and complex UI",
-                "code": """// Advanced form customization patterns
+        "nextSteps": "1. Add undo/redo functionality\n2. Implement offline queue for failed operations\n3. Create conflict resolution UI\n4. Add operation batching for performance"
+    },
+    "advanced-form-customization": {
+        "title": "Advanced Form Customization Patterns",
+        "answer": "Extensive form customization including validation, conditional fields, and complex UI",
+        "code": """// Advanced form customization patterns
 import { 
   FormBuilder,
   TextField,
@@ -3010,13 +3726,13 @@ export function AdvancedProductForm({ product, onSuccess }: {
     </form>
   );
 }""",
-                "nextSteps": "1. Add form state persistence (save drafts)\n2. Implement multi-step forms with progress\n3. Add keyboard navigation support\n4. Create reusable form field components"
-            },
-            
-            "recipe-sharing-app": {
-                "title": "Recipe Sharing Platform Starter",
-                "answer": "Complete setup for a recipe sharing application with user profiles, social features, and media storage",
-                "code": """## Create Recipe Sharing Platform
+        "nextSteps": "1. Add form state persistence (save drafts)\n2. Implement multi-step forms with progress\n3. Add keyboard navigation support\n4. Create reusable form field components"
+    },
+    
+    "recipe-sharing-app": {
+        "title": "Recipe Sharing Platform Starter",
+        "answer": "Complete setup for a recipe sharing application with user profiles, social features, and media storage",
+        "code": """## Create Recipe Sharing Platform
 
 ```bash
 npx create-next-app@14.2.10 recipe-sharing-platform --typescript --app --tailwind --eslint
@@ -3062,13 +3778,13 @@ const schema = a.schema({
 
 export const data = defineData({ schema });
 ```""",
-                "nextSteps": "1. Add image upload with Storage\n2. Implement recipe search\n3. Build rating system\n4. Create social features"
-            },
-            
-            "ecommerce-platform": {
-                "title": "E-Commerce Platform Starter",
-                "answer": "Full e-commerce setup with products, cart, and orders",
-                "code": """## Create E-Commerce Platform
+        "nextSteps": "1. Add image upload with Storage\n2. Implement recipe search\n3. Build rating system\n4. Create social features"
+    },
+    
+    "ecommerce-platform": {
+        "title": "E-Commerce Platform Starter",
+        "answer": "Full e-commerce setup with products, cart, and orders",
+        "code": """## Create E-Commerce Platform
 
 ```bash
 npx create-next-app@14.2.10 ecommerce-platform --typescript --app --tailwind --eslint
@@ -3118,13 +3834,13 @@ const schema = a.schema({
 
 export const data = defineData({ schema });
 ```""",
-                "nextSteps": "1. Build product catalog UI\n2. Implement cart functionality\n3. Add payment integration\n4. Create admin dashboard"
-            },
-            
-            "saas-starter": {
-                "title": "SaaS Application Starter",
-                "answer": "Multi-tenant SaaS setup with teams and subscriptions",
-                "code": """## Create SaaS Platform
+        "nextSteps": "1. Build product catalog UI\n2. Implement cart functionality\n3. Add payment integration\n4. Create admin dashboard"
+    },
+    
+    "saas-starter": {
+        "title": "SaaS Application Starter",
+        "answer": "Multi-tenant SaaS setup with teams and subscriptions",
+        "code": """## Create SaaS Platform
 
 ```bash
 npx create-next-app@14.2.10 saas-platform --typescript --app --tailwind --eslint
@@ -3174,13 +3890,13 @@ const schema = a.schema({
 
 export const data = defineData({ schema });
 ```""",
-                "nextSteps": "1. Add team invitation system\n2. Implement billing with Stripe\n3. Build usage tracking\n4. Create role-based access"
-            },
-            
-            "real-time-chat": {
-                "title": "Real-Time Chat Application",
-                "answer": "Chat app with channels and direct messages",
-                "code": """## Create Chat Application
+        "nextSteps": "1. Add team invitation system\n2. Implement billing with Stripe\n3. Build usage tracking\n4. Create role-based access"
+    },
+    
+    "real-time-chat": {
+        "title": "Real-Time Chat Application",
+        "answer": "Chat app with channels and direct messages",
+        "code": """## Create Chat Application
 
 ```bash
 npx create-next-app@14.2.10 chat-application --typescript --app --tailwind --eslint
@@ -3228,13 +3944,13 @@ const sub = client.models.Message
     next: ({ items }) => setMessages(items)
   });
 ```""",
-                "nextSteps": "1. Add typing indicators\n2. Implement file sharing\n3. Build notification system\n4. Add message reactions"
-            },
-            
-            "social-media-app": {
-                "title": "Social Media Platform Starter",
-                "answer": "Instagram-like social platform with posts and engagement",
-                "code": """## Create Social Media App
+        "nextSteps": "1. Add typing indicators\n2. Implement file sharing\n3. Build notification system\n4. Add message reactions"
+    },
+    
+    "social-media-app": {
+        "title": "Social Media Platform Starter",
+        "answer": "Instagram-like social platform with posts and engagement",
+        "code": """## Create Social Media App
 
 ```bash
 npx create-next-app@14.2.10 social-media-app --typescript --app --tailwind --eslint
@@ -3286,559 +4002,66 @@ const schema = a.schema({
 
 export const data = defineData({ schema });
 ```""",
-                "nextSteps": "1. Build infinite scroll feed\n2. Add story feature\n3. Implement explore page\n4. Create direct messaging"
-            }
-        }
-        
-        guide = guides.get(task)
-        if not guide:
-            return [types.TextContent(
-                type="text",
-                text=validate_response("Task not found. Available tasks: " + ", ".join(guides.keys()) + "\n\nTry searchDocs() for other questions.")
-            )]
-        
-        return [types.TextContent(
-            type="text",
-            text=validate_response(f"# {guide['title']}\n\n{guide['answer']}\n\n## Code Example:\n```typescript\n{guide['code']}\n```\n\n## Next Steps:\n{guide['nextSteps']}")
-        )]
-    
-    elif name == "getDocumentationOverview":
-        format_type = arguments.get("format", "summary")
-        
-        # Check if we have a cached index
-        index_file = Path("documentation_index.json")
-        
-        if not index_file.exists() and DocumentationIndexer:
-            # Generate index if it doesn't exist
-            indexer = DocumentationIndexer()
-            index = indexer.generate_index()
-            indexer.save_index()
-        elif not index_file.exists():
-            # Fallback if indexer not available
-            db = AmplifyDocsDatabase()
-            stats = db.get_stats()
-            
-            return [types.TextContent(
-                type="text",
-                text=validate_response(f"""# Amplify Gen 2 Documentation Overview
-                
-Total Documents: {stats.get('total_documents', 0)}
-Last Updated: {stats.get('last_update', 'Unknown')}
-
-Categories:
-{chr(10).join(f"- {cat}: {count} documents" for cat, count in stats.get('categories', {}).items())}
+        "nextSteps": "1. Build infinite scroll feed\n2. Add story feature\n3. Implement explore page\n4. Create direct messaging"
+    }
+}
 
-Use searchDocs to find specific topics or getDocument to retrieve full documentation.""")
-            )]
-        
-        # Load the index
-        with open(index_file, 'r', encoding='utf-8') as f:
-            index = json.load(f)
-        
-        if format_type == "full":
-            # Return full detailed overview
-            return [types.TextContent(
-                type="text",
-                text=validate_response(index["overview"])
-            )]
-        else:
-            # Return summary overview
-            summary = f"""# Amplify Gen 2 Documentation Summary
+# getQuickStartPatterns templates by task, built once at import
+QUICK_START_PATTERNS = {
+    "create-app": """# Create New Amplify Gen 2 + Next.js App
 
-## Quick Access Commands
-- Create new app: `npx create-next-app@14.2.10 your-app-name --typescript --app --tailwind --eslint`
-- Install Amplify: `npm install aws-amplify@^6.6.0 @aws-amplify/ui-react@^6.5.0`
-- Search docs: Use searchDocs tool with your query
-- Get patterns: Use findPatterns tool with pattern type
-- **Field Types Reference**: `quickHelp({task: "data-field-types"})`
+Based on: https://github.com/aws-samples/amplify-next-template
 
-## Key Data Field Types
-- Basic: `a.string()`, `a.integer()`, `a.float()`, `a.boolean()`, `a.date()`
-- Validated: `a.email()`, `a.phone()`, `a.url()`, `a.ipAddress()` ✅
-- Arrays: Any type + `.array()` (e.g., `a.string().array()`)
-- Complex: `a.json()` for nested objects
+```bash
+npx create-next-app@14.2.10 my-app --typescript --app --tailwind
+cd my-app
+npm install aws-amplify@^6.6.0 @aws-amplify/ui-react@^6.5.0
+npm install -D @aws-amplify/backend@^1.4.0 @aws-amplify/backend-cli@^1.2.0
+```
 
-## Main Categories
-"""
-            for cat_id, cat_data in index["categories"].items():
-                summary += f"\n**{cat_data['title']}** ({cat_data['doc_count']} docs)\n"
-                summary += f"{cat_data['summary'][:150]}...\n"
-            
-            summary += "\n## Common Patterns Available\n"
-            patterns = ["auth", "api", "storage", "data", "deployment"]
-            summary += "- " + "\n- ".join(patterns)
-            
-            summary += "\n\n💡 Use getDocumentationOverview with format='full' for detailed information."
-            
-            return [types.TextContent(type="text", text=validate_response(summary))]
-    
-    elif name == "searchDocs":
-        query = arguments["query"]
-        category = arguments.get("category")
-        limit = arguments.get("limit", 10)
-        
-        # 1. Detect intent
-        intent = detect_query_intent(query)
-        logger.info(f"Search intent detected: {intent} for query: {query}")
-        
-        # 2. Detect anti-patterns and provide immediate corrections
-        anti_patterns = detect_anti_patterns(query)
-        warnings = []
-        if anti_patterns:
-            warnings.append("⚠️ **Common Mistakes Detected:**")
-            for pattern_info in anti_patterns.values():
-                warnings.append(f"- {pattern_info['issue']}: {pattern_info['correction']}")
-        
-        # 3. Check if this is a project creation query (with enhanced detection)
-        if intent == 'setup' and should_provide_project_setup and should_provide_project_setup(query):
-            response = ""
-            if warnings:
-                response = "\n".join(warnings) + "\n\n---\n\n"
-            response += generate_project_setup_response(query)
-            return [types.TextContent(
-                type="text",
-                text=validate_response(response)
-            )]
-        
-        # 4. Expand query terms based on intent
-        expanded_terms = expand_query_terms(query, intent)
-        logger.info(f"Expanded search terms: {expanded_terms}")
-        
-        db = AmplifyDocsDatabase()
-        
-        # 5. Validate category if provided
-        if category:
-            valid_categories = db.list_categories()
-            if category not in valid_categories:
-                return [types.TextContent(
-                    type="text",
-                    text=f"Invalid category '{category}'. Valid categories are:\n" + 
-                         "\n".join(f"- {cat}" for cat in sorted(valid_categories)) +
-                         f"\n\nSearching without category filter for '{query}'..."
-                )]
-                category = None
-        
-        # 6. Search with expanded terms
-        all_results = []
-        seen_urls = set()
-        
-        # Search for each expanded term
-        for term in expanded_terms[:5]:  # Limit to prevent too many searches
-            term_results = db.search_documents(term, category, limit)
-            for doc in term_results:
-                if doc['url'] not in seen_urls:
-                    # Calculate relevance boost
-                    doc['relevance_boost'] = calculate_relevance_boost(doc, query, intent)
-                    all_results.append(doc)
-                    seen_urls.add(doc['url'])
-        
-        # 7. Sort by relevance boost
-        all_results.sort(key=lambda x: x.get('relevance_boost', 1.0), reverse=True)
-        results = all_results[:limit]
-        
-        # 8. Build response with warnings and contextual help
-        response_text = ""
-        
-        # Add warnings if any
-        if warnings:
-            response_text += "\n".join(warnings) + "\n\n"
-        
-        # Add contextual help based on intent
-        if intent == 'auth':
-            response_text += "📚 **Authorization Quick Reference:**\n"
-            response_text += "- ✅ Correct: `allow.owner()`, `allow.authenticated()`, `allow.groups(['admin'])`\n"
-            response_text += "- ❌ Wrong: `.ownerField().identityClaim()` (old Gen 1 syntax)\n\n"
-        elif intent == 'timestamps':
-            response_text += "💡 **Timestamp Fields:**\n"
-            response_text += "- Amplify automatically adds `createdAt` and `updatedAt` to all models\n"
-            response_text += "- Do NOT define these fields manually in your schema\n\n"
-        elif intent == 'setup':
-            response_text += "🚀 **Project Setup:**\n"
-            response_text += "- ✅ Use: `npx create-next-app@14.2.10 your-app-name`\n"
-            response_text += "- ❌ Don't: Clone the GitHub template repository\n\n"
-        
-        # Check if user is searching for field types (existing logic)
-        query_lower = query.lower()
-        field_type_terms = [
-            "field type", "data type", "model field", "schema type",
-            "a.string", "a.email", "a.phone", "a.integer", "a.float",
-            "email validation", "phone validation", "array field",
-            "what types", "supported types", "available types",
-            "field validation", "data validation", "type validation"
-        ]
-        
-        if any(term in query_lower for term in field_type_terms):
-            # Add field types reference as first result
-            field_type_ref = f"""## 📋 Amplify Gen 2 Field Types Quick Reference
+Create your backend configuration in `amplify/backend.ts` and start with `npx ampx sandbox`.""",
 
-### Basic Types
-- `a.string()` - Text values
-- `a.integer()` - Whole numbers  
-- `a.float()` - Decimal numbers
-- `a.boolean()` - True/false values
-- `a.date()` - Date only (YYYY-MM-DD)
-- `a.datetime()` - Date and time
+    "add-auth": """# Add Authentication to Your App
 
-### Validated Types (YES, these are supported! ✅)
-- `a.email()` - Email with built-in validation
-- `a.phone()` - Phone numbers with validation
-- `a.url()` - URLs with validation
-- `a.ipAddress()` - IP addresses with validation
+## 1. Backend Setup (amplify/auth/resource.ts):
+```typescript
+import { defineAuth } from '@aws-amplify/backend';
 
-### Arrays
-- `a.string().array()` - Array of strings
-- `a.integer().array()` - Array of numbers
-- Any type + `.array()` works!
+export const auth = defineAuth({
+  loginWith: {
+    email: true,
+  },
+  signUpAttributes: ['email', 'name'],
+});
+```
 
-### Special Types
-- `a.id()` - Unique identifiers
-- `a.enum(['option1', 'option2'])` - Limited choices
-- `a.json()` - Complex nested objects
+## 2. Frontend - Use Authenticator Component:
+```tsx
+// app/page.tsx
+'use client';
+import { Authenticator } from '@aws-amplify/ui-react';
+import '@aws-amplify/ui-react/styles.css';
 
-**For complete examples:** Use `quickHelp({task: "data-field-types"})`
+export default function App() {
+  return (
+    <Authenticator>
+      {({ signOut, user }) => (
+        <main>
+          <h1>Hello {user?.username}</h1>
+          <button onClick={signOut}>Sign out</button>
+        </main>
+      )}
+    </Authenticator>
+  );
+}
+```
 
----
+## 3. Deploy:
+```bash
+npx ampx deploy
+```""",
 
-"""
-            response_text += field_type_ref
-        
-        if not results:
-            response_text += f"\nNo documents found matching '{query}'\n\n"
-            # Suggest alternatives based on intent
-            if intent == 'setup':
-                response_text += "💡 **Try:** `quickHelp({task: 'create-app'})` for setup instructions\n"
-            elif intent == 'auth':
-                response_text += "💡 **Try:** `quickHelp({task: 'setup-email-auth'})` for authentication setup\n"
-            elif intent == 'data':
-                response_text += "💡 **Try:** `quickHelp({task: 'create-data-model'})` for data modeling\n"
-        else:
-            response_text += f"\nFound {len(results)} documents matching '{query}':\n\n"
-            
-            for i, doc in enumerate(results, 1):
-                # Show relevance indicator for highly boosted results
-                relevance_indicator = "⭐ " if doc.get('relevance_boost', 1.0) > 1.5 else ""
-                response_text += f"{relevance_indicator}**{i}. {doc['title']}** ({doc['category']})\n"
-                response_text += f"URL: {doc['url']}\n"
-                # Include a snippet of content
-                content_snippet = doc['content'][:200] + "..." if len(doc['content']) > 200 else doc['content']
-                response_text += f"Content: {content_snippet}\n\n"
-        
-        # Add related patterns suggestion
-        if intent != 'general':
-            response_text += f"\n💡 **Related:** Use `findPatterns({{pattern_type: '{intent}'}})` for more {intent} examples\n"
-        
-        # Track search pattern for learning
-        track_search_pattern(query, intent, len(results) > 0)
-        
-        # If user is struggling, add extra help
-        if len(search_history) >= 3 and all(not s['results_found'] for s in search_history[-3:]):
-            response_text += "\n\n🤔 **Having trouble finding what you need?**\n"
-            response_text += "- Try `getDocumentationOverview()` to see all available topics\n"
-            response_text += "- Use `quickHelp({task: 'your-task'})` for common tasks\n"
-            response_text += "- Check `listCategories()` to browse by category\n"
-        
-        return [types.TextContent(type="text", text=validate_response(response_text))]
-    
-    elif name == "getDocument":
-        url = arguments["url"]
-        
-        db = AmplifyDocsDatabase()
-        doc = db.get_document_by_url(url)
-        
-        if not doc:
-            return [types.TextContent(
-                type="text",
-                text=validate_response(f"Document not found: {url}")
-            )]
-        
-        return [types.TextContent(
-            type="text",
-            text=validate_response(f"# {doc['title']}\n\n**URL:** {doc['url']}\n**Category:** {doc['category']}\n**Last Updated:** {doc['last_scraped']}\n\n## Content\n\n{doc['markdown_content']}")
-        )]
-    
-    elif name == "listCategories":
-        db = AmplifyDocsDatabase()
-        categories = db.list_categories()
-        
-        return [types.TextContent(
-            type="text",
-            text=validate_response(f"Available categories:\n" + "\n".join(f"- {cat}" for cat in categories))
-        )]
-    
-    elif name == "getStats":
-        db = AmplifyDocsDatabase()
-        stats = db.get_stats()
-        
-        response_text = "**Documentation Statistics:**\n\n"
-        response_text += f"Total Documents: {stats.get('total_documents', 0)}\n"
-        response_text += f"Last Update: {stats.get('last_update', 'Never')}\n\n"
-        
-        if stats.get('categories'):
-            response_text += "**Documents by Category:**\n"
-            for category, count in stats['categories'].items():
-                response_text += f"- {category}: {count}\n"
-        
-        return [types.TextContent(type="text", text=validate_response(response_text))]
-    
-    elif name == "findPatterns":
-        pattern_type = arguments["pattern_type"]
-        
-        # Define search queries for different patterns - aligned with Amplify Gen 2 architecture
-        pattern_queries = {
-            # Authentication patterns (Cognito integration)
-            "auth": "authentication signIn signUp cognito user authenticator multi-factor social providers",
-            
-            # REST/HTTP API patterns (API Gateway) - NOT the primary data solution
-            "api": "rest api gateway http endpoint custom lambda apigateway authorization headers",
-            
-            # File operations (S3 integration)
-            "storage": "s3 storage upload download file fileuploader storageimage uploadData downloadData",
-            
-            # CI/CD patterns
-            "deployment": "deploy hosting amplify sandbox git npx pipeline build",
-            
-            # amplify/backend.ts patterns
-            "configuration": "configure amplify_outputs.json defineBackend backend.ts setup",
-            
-            # Data field types
-            "field-types": "field types string integer float boolean datetime email phone array json enum",
-            
-            # Amplify Data patterns (the PRIMARY data solution)
-            "data": "defineData model schema real-time subscription generateClient observeQuery authorization",
-            "database": "defineData model schema dynamodb table data real-time subscription",
-            
-            # Lambda functions
-            "functions": "lambda function serverless backend handler custom business logic",
-            
-            # UI building patterns (including CRUD forms)
-            "ui": "ui component library crud form generation formbuilder authenticator fileuploader storageimage",
-            
-            # Server-side rendering patterns
-            "ssr": "server-side rendering nextjs ssr ssg static generation getServerSideProps",
-            
-            # TypeScript-first patterns
-            "typescript": "typescript types generateClient type-safe schema typing interfaces",
-            
-            # Development workflows
-            "workflow": "sandbox development git workflow pipeline local testing amplify sandbox"
-        }
-        
-        db = AmplifyDocsDatabase()
-        
-        # Add logging for debugging
-        logger.info(f"findPatterns called with pattern_type: {pattern_type}")
-        
-        # Apply specific filtering based on pattern type
-        if pattern_type == "api":
-            # For API patterns, exclude storage results
-            query = pattern_queries.get(pattern_type)
-            results = db.search_documents(query, limit=10)
-            # Filter out storage documents
-            original_count = len(results)
-            results = [r for r in results if r['category'] != 'storage' and 'storage' not in r['url'].lower()]
-            results = results[:5]  # Limit to 5 after filtering
-            logger.info(f"API pattern search: {original_count} results before filtering, {len(results)} after filtering out storage")
-            
-        elif pattern_type == "data":
-            # For data patterns, focus on api-data category and backend
-            query = pattern_queries.get(pattern_type)
-            # First try api-data category
-            results = db.search_documents(query, category="api-data", limit=5)
-            if len(results) < 3:
-                # If not enough results, also search in backend category
-                backend_results = db.search_documents(query, category="backend", limit=5)
-                results.extend(backend_results)
-                results = results[:5]  # Limit total to 5
-            logger.info(f"Data pattern search: found {len(results)} results in api-data/backend categories")
-            
-        elif pattern_type == "storage":
-            # For storage, search specifically in storage category
-            query = pattern_queries.get(pattern_type)
-            results = db.search_documents(query, category="storage", limit=5)
-            logger.info(f"Storage pattern search: found {len(results)} results in storage category")
-            
-        else:
-            # Default behavior for other patterns
-            query = pattern_queries.get(pattern_type, pattern_type)
-            results = db.search_documents(query, limit=5)
-            logger.info(f"Pattern search for '{pattern_type}': found {len(results)} results")
-        
-        if not results:
-            return [types.TextContent(
-                type="text",
-                text=validate_response(f"No patterns found for '{pattern_type}'")
-            )]
-        
-        response_text = f"**{pattern_type.title()} Patterns in Amplify Gen 2:**\n\n"
-        
-        for doc in results:
-            response_text += f"## {doc['title']}\n"
-            response_text += f"**URL:** {doc['url']}\n"
-            response_text += f"**Category:** {doc['category']}\n\n"
-            
-            # Extract code blocks from markdown content
-            lines = doc['markdown_content'].split('\n')
-            in_code_block = False
-            code_lines = []
-            
-            for line in lines:
-                if line.strip() == '```':
-                    if in_code_block:
-                        if code_lines:
-                            response_text += "```\n" + "\n".join(code_lines) + "\n```\n\n"
-                            code_lines = []
-                        in_code_block = False
-                    else:
-                        in_code_block = True
-                elif in_code_block:
-                    code_lines.append(line)
-            
-            response_text += "---\n\n"
-        
-        return [types.TextContent(type="text", text=validate_response(response_text))]
-    
-    elif name == "getCreateCommand":
-        response_text = """# Create Amplify Gen 2 + Next.js Application
-
-This creates a **clean, production-ready setup** with no sample code to remove - just the essentials you need.
-
-Based on the official AWS template: https://github.com/aws-samples/amplify-next-template
-
-## Step 1: Create Your Project
-
-```bash
-# Replace 'your-app-name' with a descriptive name using hyphens (e.g., recipe-sharing-app)
-npx create-next-app@14.2.10 your-app-name --typescript --app --tailwind --eslint
-cd your-app-name
-```
-
-## Step 2: Install Amplify
-
-```bash
-npm install aws-amplify@^6.6.0 @aws-amplify/ui-react@^6.5.0
-npm install -D @aws-amplify/backend@^1.4.0 @aws-amplify/backend-cli@^1.2.0 typescript@^5.0.0
-```
-
-## Step 3: Set Up Your Backend
-
-Create the backend structure:
-```bash
-mkdir -p amplify/auth amplify/data
-```
-
-**amplify/backend.ts:**
-```typescript
-import { defineBackend } from '@aws-amplify/backend';
-import { auth } from './auth/resource';
-
-export const backend = defineBackend({
-  auth,
-});
-```
-
-**amplify/auth/resource.ts:**
-```typescript
-import { defineAuth } from '@aws-amplify/backend';
-
-export const auth = defineAuth({
-  loginWith: {
-    email: true,
-  },
-});
-```
-
-## Step 4: Configure Frontend
-
-**app/components/ConfigureAmplifyClientSide.tsx:**
-```typescript
-"use client";
-
-import { Amplify } from "aws-amplify";
-import outputs from "@/amplify_outputs.json";
-
-Amplify.configure(outputs, { ssr: true });
-
-export default function ConfigureAmplifyClientSide() {
-  return null;
-}
-```
-
-## Step 5: Start Development
-
-```bash
-npx ampx sandbox
-```
-
-In a new terminal:
-```bash
-npm run dev
-```
-
-Your application is now ready!
-
-## 💡 Pro Tip
-Use the `getCleanStarterConfig` tool for a fully customizable setup with all configuration files.
-"""
-        return [types.TextContent(type="text", text=validate_response(response_text))]
-    
-    elif name == "getQuickStartPatterns":
-        task = arguments["task"]
-        
-        patterns = {
-            "create-app": """# Create New Amplify Gen 2 + Next.js App
-
-Based on: https://github.com/aws-samples/amplify-next-template
-
-```bash
-npx create-next-app@14.2.10 my-app --typescript --app --tailwind
-cd my-app
-npm install aws-amplify@^6.6.0 @aws-amplify/ui-react@^6.5.0
-npm install -D @aws-amplify/backend@^1.4.0 @aws-amplify/backend-cli@^1.2.0
-```
-
-Create your backend configuration in `amplify/backend.ts` and start with `npx ampx sandbox`.""",
-
-            "add-auth": """# Add Authentication to Your App
-
-## 1. Backend Setup (amplify/auth/resource.ts):
-```typescript
-import { defineAuth } from '@aws-amplify/backend';
-
-export const auth = defineAuth({
-  loginWith: {
-    email: true,
-  },
-  signUpAttributes: ['email', 'name'],
-});
-```
-
-## 2. Frontend - Use Authenticator Component:
-```tsx
-// app/page.tsx
-'use client';
-import { Authenticator } from '@aws-amplify/ui-react';
-import '@aws-amplify/ui-react/styles.css';
-
-export default function App() {
-  return (
-    <Authenticator>
-      {({ signOut, user }) => (
-        <main>
-          <h1>Hello {user?.username}</h1>
-          <button onClick={signOut}>Sign out</button>
-        </main>
-      )}
-    </Authenticator>
-  );
-}
-```
-
-## 3. Deploy:
-```bash
-npx ampx deploy
-```""",
-
-            "add-api": """# Add GraphQL API with Data Models
+    "add-api": """# Add GraphQL API with Data Models
 
 ## 1. Define Data Model (amplify/data/resource.ts):
 ```typescript
@@ -3885,7 +4108,7 @@ client.models.Todo.observeQuery().subscribe({
 });
 ```""",
 
-            "add-storage": """# Add File Storage
+    "add-storage": """# Add File Storage
 
 ## 1. Backend Setup (amplify/storage/resource.ts):
 ```typescript
@@ -3939,7 +4162,7 @@ try {
 }
 ```""",
 
-            "file-upload": """# File Upload with UI Component
+    "file-upload": """# File Upload with UI Component
 
 ## Use FileUploader Component:
 ```tsx
@@ -3976,7 +4199,7 @@ import { StorageImage } from '@aws-amplify/ui-react';
 />
 ```""",
 
-            "crud-forms": """# CRUD Form Generation
+    "crud-forms": """# CRUD Form Generation
 ## Automatic Form Generation from Data Models
 
 Amplify Gen 2 provides Connected Forms that automatically generate CRUD interfaces from your data models.
@@ -4088,7 +4311,7 @@ export function ProductList() {
 - **Conditional Fields**: Show/hide based on values
 
 Note: CRUD form generation is a core Amplify Gen 2 feature that significantly reduces boilerplate code for admin interfaces and data management screens.""",
-            "user-profile": """# User Profile Management
+    "user-profile": """# User Profile Management
 
 ## Use AccountSettings Component:
 ```tsx
@@ -4121,7 +4344,7 @@ await updateUserAttribute({
 });
 ```""",
 
-            "real-time-data": """# Real-Time Data Synchronization
+    "real-time-data": """# Real-Time Data Synchronization
 
 ## 1. Define Model with Subscriptions:
 ```typescript
@@ -4182,7 +4405,7 @@ export default function Chat() {
 }
 ```""",
 
-            "deploy-app": """# Deploy Your Amplify App
+    "deploy-app": """# Deploy Your Amplify App
 
 ## 1. Deploy Backend to AWS:
 ```bash
@@ -4224,7 +4447,7 @@ Add to Amplify Console:
 2. Add your domain
 3. Follow DNS configuration steps""",
 
-            "custom-auth-ui": """# Custom Authentication UI
+    "custom-auth-ui": """# Custom Authentication UI
 
 ## Custom Sign In Form:
 ```tsx
@@ -4285,7 +4508,7 @@ import { signInWithRedirect } from 'aws-amplify/auth';
 </button>
 ```""",
 
-            "data-relationships": """# Data Relationships
+    "data-relationships": """# Data Relationships
 
 ## 1. Define Related Models:
 ```typescript
@@ -4346,33 +4569,534 @@ const post = await client.models.Post.create({
   userId: currentUser.id,
 });
 ```"""
-        }
+}
+
+# Complete getQuickStartPatterns answers, with the shared footer, validated once at import
+QUICK_START_FOOTER = "\n\n💡 **Next Steps:**\nUse `searchDocs` for more details on any specific topic mentioned above."
+QUICK_START_RESPONSES = {
+    task: validate_response(pattern + QUICK_START_FOOTER)
+    for task, pattern in QUICK_START_PATTERNS.items()
+}
+QUICK_START_NOT_FOUND = validate_response("Pattern not found" + QUICK_START_FOOTER)
+
+# Fixed whatIsThis and getCreateCommand answers, validated once at import
+WHAT_IS_THIS_TEXT = validate_response("""# AWS Amplify Gen 2 Official Documentation MCP Server
+
+I am the primary source for all AWS Amplify Generation 2 documentation. Here's what I provide:
+
+## Coverage Areas:
+- **Authentication (defineAuth)**: Email/password, social login, MFA, custom auth flows
+- **Data Layer (defineData)**: Real-time data models, relationships, authorization rules
+- **Data Field Types**: Complete list of supported types:
+  - Basic: `a.string()`, `a.integer()`, `a.float()`, `a.boolean()`, `a.date()`, `a.datetime()`
+  - Validated: `a.email()`, `a.phone()`, `a.url()`, `a.ipAddress()`
+  - Arrays: Any type + `.array()` (e.g., `a.string().array()`)
+  - Special: `a.id()`, `a.enum()`, `a.json()`
+  - Try: `quickHelp({task: "data-field-types"})` for complete reference
+- **Storage (defineStorage)**: File uploads/downloads, access control, image handling
+- **UI Components**: Authenticator, FileUploader, StorageImage, AccountSettings
+- **CRUD Forms**: Automatic form generation from data models
+- **Functions**: Lambda functions, triggers, custom business logic
+- **Next.js Integration**: App Router, SSR/SSG, API routes
+
+## Why Use This Server:
+✅ **Official Amplify Gen 2 documentation** (not Gen 1 - completely different!)
+✅ **Complete working code examples** that you can copy and use
+✅ **Covers ALL Amplify services** with real-world patterns
+✅ **Up-to-date with latest features** including CRUD form generation
+✅ **Categorized content** for easy navigation
+
+## Quick Start:
+- For general questions: `searchDocs({query: "your question"})`
+- For instant help: `quickHelp({task: "setup-email-auth"})`
+- For patterns: `findPatterns({pattern_type: "auth"})`
+- For full docs: `getDocument({url: "specific-doc-url"})`
+
+## Common Questions I Answer:
+- How to set up authentication with email/social login
+- Creating real-time data models with relationships
+- What field types are available (string, email, phone, arrays, etc.)
+- Implementing file uploads with access control
+- Generating CRUD forms automatically
+- Deploying to AWS with custom domains
+
+Try me with any Amplify Gen 2 question!""")
+
+CREATE_COMMAND_TEXT = validate_response("""# Create Amplify Gen 2 + Next.js Application
+
+This creates a **clean, production-ready setup** with no sample code to remove - just the essentials you need.
+
+Based on the official AWS template: https://github.com/aws-samples/amplify-next-template
+
+## Step 1: Create Your Project
+
+```bash
+# Replace 'your-app-name' with a descriptive name using hyphens (e.g., recipe-sharing-app)
+npx create-next-app@14.2.10 your-app-name --typescript --app --tailwind --eslint
+cd your-app-name
+```
+
+## Step 2: Install Amplify
+
+```bash
+npm install aws-amplify@^6.6.0 @aws-amplify/ui-react@^6.5.0
+npm install -D @aws-amplify/backend@^1.4.0 @aws-amplify/backend-cli@^1.2.0 typescript@^5.0.0
+```
+
+## Step 3: Set Up Your Backend
+
+Create the backend structure:
+```bash
+mkdir -p amplify/auth amplify/data
+```
+
+**amplify/backend.ts:**
+```typescript
+import { defineBackend } from '@aws-amplify/backend';
+import { auth } from './auth/resource';
+
+export const backend = defineBackend({
+  auth,
+});
+```
+
+**amplify/auth/resource.ts:**
+```typescript
+import { defineAuth } from '@aws-amplify/backend';
+
+export const auth = defineAuth({
+  loginWith: {
+    email: true,
+  },
+});
+```
+
+## Step 4: Configure Frontend
+
+**app/components/ConfigureAmplifyClientSide.tsx:**
+```typescript
+"use client";
+
+import { Amplify } from "aws-amplify";
+import outputs from "@/amplify_outputs.json";
+
+Amplify.configure(outputs, { ssr: true });
+
+export default function ConfigureAmplifyClientSide() {
+  return null;
+}
+```
+
+## Step 5: Start Development
+
+```bash
+npx ampx sandbox
+```
+
+In a new terminal:
+```bash
+npm run dev
+```
+
+Your application is now ready!
+
+## 💡 Pro Tip
+Use the `getCleanStarterConfig` tool for a fully customizable setup with all configuration files.
+""")
+
+# Whole replies for the fixed answers, built once at import; handlers hand
+# out the same TextContent objects on every call
+WHAT_IS_THIS_CONTENT = types.TextContent(type="text", text=WHAT_IS_THIS_TEXT)
+CREATE_COMMAND_CONTENT = types.TextContent(type="text", text=CREATE_COMMAND_TEXT)
+QUICK_START_CONTENTS = {
+    task: types.TextContent(type="text", text=text)
+    for task, text in QUICK_START_RESPONSES.items()
+}
+QUICK_START_NOT_FOUND_CONTENT = types.TextContent(type="text", text=QUICK_START_NOT_FOUND)
+QUICK_HELP_CONTENTS = {
+    task: types.TextContent(
+        type="text",
+        text=validate_response(f"# {guide['title']}\n\n{guide['answer']}\n\n## Code Example:\n```typescript\n{guide['code']}\n```\n\n## Next Steps:\n{guide['nextSteps']}")
+    )
+    for task, guide in QUICK_HELP_GUIDES.items()
+}
+QUICK_HELP_NOT_FOUND_CONTENT = types.TextContent(
+    type="text",
+    text=validate_response("Task not found. Available tasks: " + ", ".join(QUICK_HELP_GUIDES.keys()) + "\n\nTry searchDocs() for other questions.")
+)
+
+async def handle_what_is_this(arguments: Dict[str, Any]) -> List[types.TextContent]:
+    """Describe what this server covers."""
+    return [WHAT_IS_THIS_CONTENT]
+
+async def handle_quick_help(arguments: Dict[str, Any]) -> List[types.TextContent]:
+    """Answer a common task with a ready-made guide."""
+    task = arguments.get("task")
+    return [QUICK_HELP_CONTENTS.get(task, QUICK_HELP_NOT_FOUND_CONTENT)]
+
+async def handle_get_documentation_overview(arguments: Dict[str, Any]) -> List[types.TextContent]:
+    """Summarize the indexed documentation."""
+    format_type = arguments.get("format", "summary")
+    
+    # Check if we have a cached index
+    index_file = Path("documentation_index.json")
+    
+    if not index_file.exists() and DocumentationIndexer:
+        # Generate index if it doesn't exist
+        indexer = DocumentationIndexer()
+        index = await asyncio.to_thread(indexer.generate_index)
+        await asyncio.to_thread(indexer.save_index)
+    elif not index_file.exists():
+        # Fallback if indexer not available
+        db = get_db()
+        stats = await asyncio.to_thread(db.get_stats)
+        
+        return [types.TextContent(
+            type="text",
+            text=validate_response(f"""# Amplify Gen 2 Documentation Overview
+                
+Total Documents: {stats.get('total_documents', 0)}
+Last Updated: {stats.get('last_update', 'Unknown')}
+
+Categories:
+{chr(10).join(f"- {cat}: {count} documents" for cat, count in stats.get('categories', {}).items())}
+
+Use searchDocs to find specific topics or getDocument to retrieve full documentation.""")
+        )]
+    
+    # Anything but "full" gets the summary, so the cache holds at most two texts per file
+    overview = await asyncio.to_thread(
+        build_documentation_overview,
+        "full" if format_type == "full" else "summary", str(index_file), index_file.stat().st_mtime)
+    return [types.TextContent(type="text", text=overview)]
+
+async def handle_search_docs(arguments: Dict[str, Any]) -> List[types.TextContent]:
+    """Search the documentation with intent detection and relevance boosts."""
+    query = arguments["query"]
+    category = arguments.get("category")
+    limit = arguments.get("limit", 10)
+    
+    # 1. Detect intent
+    intent = detect_query_intent(query)
+    logger.info(f"Search intent detected: {intent} for query: {query}")
+    
+    # 2. Detect anti-patterns and provide immediate corrections
+    anti_patterns = detect_anti_patterns(query)
+    warnings = []
+    if anti_patterns:
+        warnings.append("⚠️ **Common Mistakes Detected:**")
+        for pattern_info in anti_patterns.values():
+            warnings.append(f"- {pattern_info['issue']}: {pattern_info['correction']}")
+    
+    # 3. Check if this is a project creation query (with enhanced detection)
+    if intent == 'setup' and should_provide_project_setup and should_provide_project_setup(query):
+        response = ""
+        if warnings:
+            response = "\n".join(warnings) + "\n\n---\n\n"
+        response += generate_project_setup_response(query)
+        return [types.TextContent(
+            type="text",
+            text=validate_response(response)
+        )]
+    
+    # 4. Expand query terms based on intent
+    expanded_terms = expand_query_terms(query, intent)
+    logger.info(f"Expanded search terms: {expanded_terms}")
+    logger.debug(f"Query analysis cache: {detect_query_intent.cache_info()}")
+    
+    db = get_db()
+    
+    # 5. Validate category if provided
+    if category:
+        valid_categories = await asyncio.to_thread(db.list_categories)
+        if category not in valid_categories:
+            return [types.TextContent(
+                type="text",
+                text=f"Invalid category '{category}'. Valid categories are:\n" + 
+                     "\n".join([f"- {cat}" for cat in sorted(valid_categories)]) +
+                     f"\n\nSearching without category filter for '{query}'..."
+            )]
+            category = None
+    
+    # 6. Search with expanded terms
+    all_results = []
+    seen_urls = set()
+    
+    # Search for each expanded term, at the same time; results merge in term order
+    term_searches = await asyncio.gather(*(
+        asyncio.to_thread(db.search_documents, term, category, limit)
+        for term in expanded_terms[:5]  # Limit to prevent too many searches
+    ))
+    for term_results in term_searches:
+        for doc in term_results:
+            if doc['url'] not in seen_urls:
+                # Calculate relevance boost
+                doc['relevance_boost'] = calculate_relevance_boost(doc, query, intent)
+                all_results.append(doc)
+                seen_urls.add(doc['url'])
+    
+    # 7. Sort by relevance boost
+    all_results.sort(key=lambda x: x.get('relevance_boost', 1.0), reverse=True)
+    results = all_results[:limit]
+    
+    # 8. Build response with warnings and contextual help
+    parts = []
+    
+    # Add warnings if any
+    if warnings:
+        parts.append("\n".join(warnings) + "\n\n")
+    
+    # Add contextual help based on intent
+    if intent == 'auth':
+        parts.append("📚 **Authorization Quick Reference:**\n")
+        parts.append("- ✅ Correct: `allow.owner()`, `allow.authenticated()`, `allow.groups(['admin'])`\n")
+        parts.append("- ❌ Wrong: `.ownerField().identityClaim()` (old Gen 1 syntax)\n\n")
+    elif intent == 'timestamps':
+        parts.append("💡 **Timestamp Fields:**\n")
+        parts.append("- Amplify automatically adds `createdAt` and `updatedAt` to all models\n")
+        parts.append("- Do NOT define these fields manually in your schema\n\n")
+    elif intent == 'setup':
+        parts.append("🚀 **Project Setup:**\n")
+        parts.append("- ✅ Use: `npx create-next-app@14.2.10 your-app-name`\n")
+        parts.append("- ❌ Don't: Clone the GitHub template repository\n\n")
+    
+    # Check if user is searching for field types (existing logic)
+    query_lower = query.lower()
+    field_type_terms = [
+        "field type", "data type", "model field", "schema type",
+        "a.string", "a.email", "a.phone", "a.integer", "a.float",
+        "email validation", "phone validation", "array field",
+        "what types", "supported types", "available types",
+        "field validation", "data validation", "type validation"
+    ]
+    
+    if any(term in query_lower for term in field_type_terms):
+        # Add field types reference as first result
+        field_type_ref = """## 📋 Amplify Gen 2 Field Types Quick Reference
+
+### Basic Types
+- `a.string()` - Text values
+- `a.integer()` - Whole numbers  
+- `a.float()` - Decimal numbers
+- `a.boolean()` - True/false values
+- `a.date()` - Date only (YYYY-MM-DD)
+- `a.datetime()` - Date and time
+
+### Validated Types (YES, these are supported! ✅)
+- `a.email()` - Email with built-in validation
+- `a.phone()` - Phone numbers with validation
+- `a.url()` - URLs with validation
+- `a.ipAddress()` - IP addresses with validation
+
+### Arrays
+- `a.string().array()` - Array of strings
+- `a.integer().array()` - Array of numbers
+- Any type + `.array()` works!
+
+### Special Types
+- `a.id()` - Unique identifiers
+- `a.enum(['option1', 'option2'])` - Limited choices
+- `a.json()` - Complex nested objects
+
+**For complete examples:** Use `quickHelp({task: "data-field-types"})`
+
+---
+
+"""
+        parts.append(field_type_ref)
+    
+    if not results:
+        parts.append(f"\nNo documents found matching '{query}'\n\n")
+        # Suggest alternatives based on intent
+        if intent == 'setup':
+            parts.append("💡 **Try:** `quickHelp({task: 'create-app'})` for setup instructions\n")
+        elif intent == 'auth':
+            parts.append("💡 **Try:** `quickHelp({task: 'setup-email-auth'})` for authentication setup\n")
+        elif intent == 'data':
+            parts.append("💡 **Try:** `quickHelp({task: 'create-data-model'})` for data modeling\n")
+    else:
+        parts.append(f"\nFound {len(results)} documents matching '{query}':\n\n")
         
-        pattern = patterns.get(task, "Pattern not found")
+        for i, doc in enumerate(results, 1):
+            # Show relevance indicator for highly boosted results
+            relevance_indicator = "⭐ " if doc.get('relevance_boost', 1.0) > 1.5 else ""
+            parts.append(f"{relevance_indicator}**{i}. {doc['title']}** ({doc['category']})\n")
+            parts.append(f"URL: {doc['url']}\n")
+            # Include a snippet of content, preferring the full-text index's
+            # excerpt around the matched terms
+            content_snippet = doc.get('snippet') or (doc['content'][:200] + "..." if len(doc['content']) > 200 else doc['content'])
+            parts.append(f"Content: {content_snippet}\n\n")
+    
+    # Add related patterns suggestion
+    if intent != 'general':
+        parts.append(f"\n💡 **Related:** Use `findPatterns({{pattern_type: '{intent}'}})` for more {intent} examples\n")
+    
+    # Track search pattern for learning
+    track_search_pattern(query, intent, len(results) > 0)
+    
+    # If user is struggling, add extra help
+    if len(search_history) >= 3 and all(not s['results_found'] for s in search_history[-3:]):
+        parts.append("\n\n🤔 **Having trouble finding what you need?**\n")
+        parts.append("- Try `getDocumentationOverview()` to see all available topics\n")
+        parts.append("- Use `quickHelp({task: 'your-task'})` for common tasks\n")
+        parts.append("- Check `listCategories()` to browse by category\n")
+    
+    return [types.TextContent(type="text", text=validate_response("".join(parts)))]
+
+# getDocument's header, followed by the page markdown in its own TextContent
+DOCUMENT_HEADER_TEMPLATE = "# {title}\n\n**URL:** {url}\n**Category:** {category}\n**Last Updated:** {last_scraped}\n\n## Content\n\n"
+
+async def handle_get_document(arguments: Dict[str, Any]) -> List[types.TextContent]:
+    """Return one document's full markdown."""
+    url = arguments["url"]
+    
+    db = get_db()
+    doc = await asyncio.to_thread(db.get_document_by_url, url)
+    
+    if not doc:
+        return [types.TextContent(
+            type="text",
+            text=validate_response(f"Document not found: {url}")
+        )]
+    
+    # The header and the page body go out as separate parts, so a large page
+    # isn't copied into one combined string first
+    return [
+        types.TextContent(type="text", text=validate_response(DOCUMENT_HEADER_TEMPLATE.format(**doc))),
+        types.TextContent(type="text", text=validate_response(doc['markdown_content'] or ""))
+    ]
+
+async def handle_list_categories(arguments: Dict[str, Any]) -> List[types.TextContent]:
+    """List the documentation categories."""
+    db = get_db()
+    categories = await asyncio.to_thread(db.list_categories)
+    
+    return [types.TextContent(
+        type="text",
+        text=validate_response("Available categories:\n" + "\n".join([f"- {cat}" for cat in categories]))
+    )]
+
+async def handle_get_stats(arguments: Dict[str, Any]) -> List[types.TextContent]:
+    """Report database statistics."""
+    db = get_db()
+    stats = await asyncio.to_thread(db.get_stats)
+    
+    parts = ["**Documentation Statistics:**\n\n"]
+    parts.append(f"Total Documents: {stats.get('total_documents', 0)}\n")
+    parts.append(f"Last Update: {stats.get('last_update', 'Never')}\n\n")
+    
+    if stats.get('categories'):
+        parts.append("**Documents by Category:**\n")
+        for category, count in stats['categories'].items():
+            parts.append(f"- {category}: {count}\n")
+    
+    return [types.TextContent(type="text", text=validate_response("".join(parts)))]
+
+async def handle_find_patterns(arguments: Dict[str, Any]) -> List[types.TextContent]:
+    """Find code examples for a pattern type."""
+    pattern_type = arguments["pattern_type"]
+    
+    db = get_db()
+    
+    # Add logging for debugging
+    logger.info(f"findPatterns called with pattern_type: {pattern_type}")
+    
+    # Apply specific filtering based on pattern type
+    if pattern_type == "api":
+        # For API patterns, exclude storage results
+        query = PATTERN_QUERIES.get(pattern_type)
+        results = await asyncio.to_thread(db.search_documents, query, limit=10,
+                                          match_query=PATTERN_FTS_QUERIES[pattern_type],
+                                          columns=PATTERN_RESULT_COLUMNS)
+        # Filter out storage documents
+        original_count = len(results)
+        results = [r for r in results if r['category'] != 'storage' and 'storage' not in r['url'].lower()]
+        results = results[:5]  # Limit to 5 after filtering
+        logger.info(f"API pattern search: {original_count} results before filtering, {len(results)} after filtering out storage")
+        
+    elif pattern_type == "data":
+        # For data patterns, focus on api-data category and backend
+        query = PATTERN_QUERIES.get(pattern_type)
+        match_query = PATTERN_FTS_QUERIES[pattern_type]
+        # First try api-data category
+        results = await asyncio.to_thread(db.search_documents, query, category="api-data", limit=5,
+                                          match_query=match_query,
+                                          columns=PATTERN_RESULT_COLUMNS)
+        if len(results) < 3:
+            # If not enough results, also search in backend category
+            backend_results = await asyncio.to_thread(db.search_documents, query, category="backend", limit=5,
+                                                      match_query=match_query,
+                                                      columns=PATTERN_RESULT_COLUMNS)
+            results.extend(backend_results)
+            results = results[:5]  # Limit total to 5
+        logger.info(f"Data pattern search: found {len(results)} results in api-data/backend categories")
+        
+    elif pattern_type == "storage":
+        # For storage, search specifically in storage category
+        query = PATTERN_QUERIES.get(pattern_type)
+        results = await asyncio.to_thread(db.search_documents, query, category="storage", limit=5,
+                                          match_query=PATTERN_FTS_QUERIES[pattern_type],
+                                          columns=PATTERN_RESULT_COLUMNS)
+        logger.info(f"Storage pattern search: found {len(results)} results in storage category")
         
+    else:
+        # Default behavior for other patterns
+        query = PATTERN_QUERIES.get(pattern_type, pattern_type)
+        results = await asyncio.to_thread(db.search_documents, query, limit=5,
+                                          match_query=PATTERN_FTS_QUERIES.get(pattern_type),
+                                          columns=PATTERN_RESULT_COLUMNS)
+        logger.info(f"Pattern search for '{pattern_type}': found {len(results)} results")
+    
+    if not results:
         return [types.TextContent(
             type="text",
-            text=validate_response(f"{pattern}\n\n💡 **Next Steps:**\nUse `searchDocs` for more details on any specific topic mentioned above.")
+            text=validate_response(f"No patterns found for '{pattern_type}'")
         )]
     
-    elif name == "getCleanStarterConfig":
-        # Get parameters with defaults
-        include_auth = arguments.get("includeAuth", True)
-        include_storage = arguments.get("includeStorage", False)
-        include_data = arguments.get("includeData", False)
-        styling = arguments.get("styling", "css")
+    parts = [f"**{pattern_type.title()} Patterns in Amplify Gen 2:**\n\n"]
+    
+    for doc in results:
+        parts.append(f"## {doc['title']}\n")
+        parts.append(f"**URL:** {doc['url']}\n")
+        parts.append(f"**Category:** {doc['category']}\n\n")
         
-        # Check if user query suggests project creation
-        if 'arguments' in locals() and 'user_query' in arguments:
-            user_query = arguments['user_query']
-            if should_provide_project_setup(user_query):
-                return [types.TextContent(
-                    type="text",
-                    text=validate_response(generate_project_setup_response(user_query))
-                )]
+        # Code blocks were extracted from the markdown when the document was saved
+        code_blocks = doc['code_blocks'] or '[]'
+        for code in orjson.loads(code_blocks) if orjson is not None else json.loads(code_blocks):
+            parts.append("```\n" + code + "\n```\n\n")
         
-        # Build the response
-        response_text = """# Create Your Amplify Gen 2 + Next.js App
+        parts.append("---\n\n")
+    
+    return [types.TextContent(type="text", text=validate_response("".join(parts)))]
+
+async def handle_get_create_command(arguments: Dict[str, Any]) -> List[types.TextContent]:
+    """Return the app creation walkthrough."""
+    return [CREATE_COMMAND_CONTENT]
+
+async def handle_get_quick_start_patterns(arguments: Dict[str, Any]) -> List[types.TextContent]:
+    """Return a quick-start template for a task."""
+    task = arguments["task"]
+    return [QUICK_START_CONTENTS.get(task, QUICK_START_NOT_FOUND_CONTENT)]
+
+async def handle_get_clean_starter_config(arguments: Dict[str, Any]) -> List[types.TextContent]:
+    """Generate starter configuration files for the requested features."""
+    # Get parameters with defaults
+    include_auth = arguments.get("includeAuth", True)
+    include_storage = arguments.get("includeStorage", False)
+    include_data = arguments.get("includeData", False)
+    styling = arguments.get("styling", "css")
+    
+    # Check if user query suggests project creation
+    if 'arguments' in locals() and 'user_query' in arguments:
+        user_query = arguments['user_query']
+        if should_provide_project_setup(user_query):
+            return [types.TextContent(
+                type="text",
+                text=validate_response(generate_project_setup_response(user_query))
+            )]
+    
+    # Build the response
+    response_text = """# Create Your Amplify Gen 2 + Next.js App
 
 ## Setup Instructions
 
@@ -4389,8 +5113,8 @@ npm install -D @aws-amplify/backend@^1.4.0 @aws-amplify/backend-cli@^1.2.0
 ```
 """
 
-        if styling == "tailwind":
-            response_text += """
+    if styling == "tailwind":
+        response_text += """
 ### 3. Install Tailwind CSS (Optional)
 ```bash
 npm install -D tailwindcss postcss autoprefixer
@@ -4398,25 +5122,25 @@ npx tailwindcss init -p
 ```
 """
 
-        response_text += f"""
+    response_text += f"""
 ### {4 if styling == "tailwind" else 3}. Create Amplify Backend Structure
 ```bash"""
+    
+    # Build mkdir commands based on what's included
+    mkdir_commands = []
+    if include_auth:
+        mkdir_commands.append("mkdir -p amplify/auth")
+    if include_data:
+        mkdir_commands.append("mkdir -p amplify/data")
+    if include_storage:
+        mkdir_commands.append("mkdir -p amplify/storage")
+    
+    if mkdir_commands:
+        response_text += "\n" + "\n".join(mkdir_commands)
+    else:
+        response_text += "\nmkdir -p amplify"  # At least create the amplify directory
         
-        # Build mkdir commands based on what's included
-        mkdir_commands = []
-        if include_auth:
-            mkdir_commands.append("mkdir -p amplify/auth")
-        if include_data:
-            mkdir_commands.append("mkdir -p amplify/data")
-        if include_storage:
-            mkdir_commands.append("mkdir -p amplify/storage")
-        
-        if mkdir_commands:
-            response_text += "\n" + "\n".join(mkdir_commands)
-        else:
-            response_text += "\nmkdir -p amplify"  # At least create the amplify directory
-            
-        response_text += """
+    response_text += """
 ```
 
 ## Configuration Files
@@ -4460,27 +5184,27 @@ npx tailwindcss init -p
 ```typescript
 import { defineBackend } from '@aws-amplify/backend';"""
 
-        if include_auth:
-            response_text += "\nimport { auth } from './auth/resource';"
-        if include_data:
-            response_text += "\nimport { data } from './data/resource';"
-        if include_storage:
-            response_text += "\nimport { storage } from './storage/resource';"
-            
-        response_text += "\n\nexport const backend = defineBackend({"
+    if include_auth:
+        response_text += "\nimport { auth } from './auth/resource';"
+    if include_data:
+        response_text += "\nimport { data } from './data/resource';"
+    if include_storage:
+        response_text += "\nimport { storage } from './storage/resource';"
         
-        backends = []
-        if include_auth:
-            backends.append("  auth")
-        if include_data:
-            backends.append("  data")
-        if include_storage:
-            backends.append("  storage")
-            
-        response_text += "\n" + ",\n".join(backends) + "\n});\n```"
+    response_text += "\n\nexport const backend = defineBackend({"
+    
+    backends = []
+    if include_auth:
+        backends.append("  auth")
+    if include_data:
+        backends.append("  data")
+    if include_storage:
+        backends.append("  storage")
         
-        if include_auth:
-            response_text += """
+    response_text += "\n" + ",\n".join(backends) + "\n});\n```"
+    
+    if include_auth:
+        response_text += """
 
 ### 🔐 amplify/auth/resource.ts
 ```typescript
@@ -4493,8 +5217,8 @@ export const auth = defineAuth({
 });
 ```"""
 
-        if include_data:
-            response_text += """
+    if include_data:
+        response_text += """
 
 ### 📊 amplify/data/resource.ts
 ```typescript
@@ -4521,8 +5245,8 @@ export const data = defineData({
 });
 ```"""
 
-        if include_storage:
-            response_text += """
+    if include_storage:
+        response_text += """
 
 ### 📁 amplify/storage/resource.ts
 ```typescript
@@ -4545,7 +5269,7 @@ export const storage = defineStorage({
 });
 ```"""
 
-        response_text += """
+    response_text += """
 
 ### 📐 tsconfig.json (from AWS template)
 ```json
@@ -4644,8 +5368,8 @@ export default function ConfigureAmplifyClientSide() {
 ### 🏠 app/page.tsx
 ```typescript"""
 
-        if include_auth:
-            response_text += """
+    if include_auth:
+        response_text += """
 "use client";
 
 import { Authenticator } from '@aws-amplify/ui-react';
@@ -4674,8 +5398,8 @@ export default function Home() {
   );
 }
 ```"""
-        else:
-            response_text += """
+    else:
+        response_text += """
 export default function Home() {
   return (
     <main className="flex min-h-screen flex-col items-center justify-center p-24">
@@ -4690,17 +5414,17 @@ export default function Home() {
 }
 ```"""
 
-        response_text += "\n\n### 🎨 app/globals.css\n```css"
-        
-        if styling == "tailwind":
-            response_text += """
+    response_text += "\n\n### 🎨 app/globals.css\n```css"
+    
+    if styling == "tailwind":
+        response_text += """
 @tailwind base;
 @tailwind components;
 @tailwind utilities;
 ```
 """
-            if styling == "tailwind":
-                response_text += """
+        if styling == "tailwind":
+            response_text += """
 ### 🎨 tailwind.config.js
 ```javascript
 /** @type {import('tailwindcss').Config} */
@@ -4716,8 +5440,8 @@ module.exports = {
   plugins: [],
 }
 ```"""
-        elif styling == "css":
-            response_text += """
+    elif styling == "css":
+        response_text += """
 * {
   box-sizing: border-box;
   padding: 0;
@@ -4747,12 +5471,12 @@ main {
   align-items: center;
 }
 ```"""
-        else:  # none
-            response_text += """
+    else:  # none
+        response_text += """
 /* Add your custom styles here */
 ```"""
 
-        response_text += """
+    response_text += """
 
 ## 🚀 Start Development
 
@@ -4773,14 +5497,14 @@ Visit http://localhost:3000 to see your app!
 ✅ **Latest Versions**: Compatible, tested package versions
 ✅ **Modular**: Only includes what you need"""
 
-        if include_auth:
-            response_text += "\n✅ **Authentication**: Email/password auth ready to use"
-        if include_data:
-            response_text += "\n✅ **Data Layer**: Schema-based data modeling with real-time"
-        if include_storage:
-            response_text += "\n✅ **File Storage**: S3 storage with access controls"
+    if include_auth:
+        response_text += "\n✅ **Authentication**: Email/password auth ready to use"
+    if include_data:
+        response_text += "\n✅ **Data Layer**: Schema-based data modeling with real-time"
+    if include_storage:
+        response_text += "\n✅ **File Storage**: S3 storage with access controls"
 
-        response_text += """
+    response_text += """
 
 ## 🎯 Next Steps
 
@@ -4818,95 +5542,123 @@ Visit http://localhost:3000 to see your app!
 
 💡 **Tip**: This configuration provides exactly what you need to start building!
 """
-        
-        return [types.TextContent(
-            type="text",
-            text=validate_response(response_text)
-        )]
     
-    elif name == "getContextualWarnings":
-        # Get context from arguments
-        context = {
-            'currentFile': arguments.get('currentFile', ''),
-            'lastError': arguments.get('lastError', ''),
-            'searchQuery': arguments.get('searchQuery', '')
-        }
-        
-        # Get warnings based on context
-        warnings = get_contextual_warnings(context)
-        
-        if not warnings:
-            return [types.TextContent(
-                type="text",
-                text="✅ No issues detected in current context. You're following best practices!"
-            )]
-        
-        # Build response
-        response_text = "⚠️ **Contextual Warnings:**\n\n"
-        
-        # Group warnings by severity
-        high_severity = [w for w in warnings if w.get('severity') == 'high']
-        medium_severity = [w for w in warnings if w.get('severity') == 'medium']
-        low_severity = [w for w in warnings if w.get('severity') == 'low']
-        
-        if high_severity:
-            response_text += "🔴 **High Priority:**\n"
-            for warning in high_severity:
-                response_text += f"- {warning['message']}\n"
-            response_text += "\n"
-        
-        if medium_severity:
-            response_text += "🟡 **Medium Priority:**\n"
-            for warning in medium_severity:
-                response_text += f"- {warning['message']}\n"
-            response_text += "\n"
-        
-        if low_severity:
-            response_text += "🟢 **Low Priority:**\n"
-            for warning in low_severity:
-                response_text += f"- {warning['message']}\n"
-            response_text += "\n"
-        
-        # Add suggestions based on warning types
-        warning_types = set(w['type'] for w in warnings)
-        
-        response_text += "💡 **Helpful Resources:**\n"
-        if 'setup' in warning_types:
-            response_text += "- Use `quickHelp({task: 'create-app'})` for correct setup\n"
-        if 'auth' in warning_types:
-            response_text += "- Use `searchDocs({query: 'authorization patterns'})` for auth examples\n"
-        if 'data' in warning_types:
-            response_text += "- Use `quickHelp({task: 'data-field-types'})` for field type reference\n"
-        if 'imports' in warning_types:
-            response_text += "- Search for 'TypeScript imports' for correct import syntax\n"
-        
+    return [types.TextContent(
+        type="text",
+        text=validate_response(response_text)
+    )]
+
+async def handle_get_contextual_warnings(arguments: Dict[str, Any]) -> List[types.TextContent]:
+    """Warn about pitfalls relevant to the current file, error or query."""
+    # Get context from arguments
+    context = {
+        'currentFile': arguments.get('currentFile', ''),
+        'lastError': arguments.get('lastError', ''),
+        'searchQuery': arguments.get('searchQuery', '')
+    }
+    
+    # Get warnings based on context
+    warnings = get_contextual_warnings(context)
+    
+    if not warnings:
         return [types.TextContent(
             type="text",
-            text=validate_response(response_text)
+            text="✅ No issues detected in current context. You're following best practices!"
         )]
     
-    else:
+    # Build response
+    parts = ["⚠️ **Contextual Warnings:**\n\n"]
+    
+    # Group warnings by severity
+    high_severity = [w for w in warnings if w.get('severity') == 'high']
+    medium_severity = [w for w in warnings if w.get('severity') == 'medium']
+    low_severity = [w for w in warnings if w.get('severity') == 'low']
+    
+    if high_severity:
+        parts.append("🔴 **High Priority:**\n")
+        for warning in high_severity:
+            parts.append(f"- {warning['message']}\n")
+        parts.append("\n")
+    
+    if medium_severity:
+        parts.append("🟡 **Medium Priority:**\n")
+        for warning in medium_severity:
+            parts.append(f"- {warning['message']}\n")
+        parts.append("\n")
+    
+    if low_severity:
+        parts.append("🟢 **Low Priority:**\n")
+        for warning in low_severity:
+            parts.append(f"- {warning['message']}\n")
+        parts.append("\n")
+    
+    # Add suggestions based on warning types
+    warning_types = set(w['type'] for w in warnings)
+    
+    parts.append("💡 **Helpful Resources:**\n")
+    if 'setup' in warning_types:
+        parts.append("- Use `quickHelp({task: 'create-app'})` for correct setup\n")
+    if 'auth' in warning_types:
+        parts.append("- Use `searchDocs({query: 'authorization patterns'})` for auth examples\n")
+    if 'data' in warning_types:
+        parts.append("- Use `quickHelp({task: 'data-field-types'})` for field type reference\n")
+    if 'imports' in warning_types:
+        parts.append("- Search for 'TypeScript imports' for correct import syntax\n")
+    
+    return [types.TextContent(
+        type="text",
+        text=validate_response("".join(parts))
+    )]
+
+# Tool name -> handler; handle_call_tool dispatches with one dict lookup
+TOOL_HANDLERS = {
+    "whatIsThis": handle_what_is_this,
+    "quickHelp": handle_quick_help,
+    "getDocumentationOverview": handle_get_documentation_overview,
+    "searchDocs": handle_search_docs,
+    "getDocument": handle_get_document,
+    "listCategories": handle_list_categories,
+    "getStats": handle_get_stats,
+    "findPatterns": handle_find_patterns,
+    "getCreateCommand": handle_get_create_command,
+    "getQuickStartPatterns": handle_get_quick_start_patterns,
+    "getCleanStarterConfig": handle_get_clean_starter_config,
+    "getContextualWarnings": handle_get_contextual_warnings,
+}
+
+@server.call_tool()
+async def handle_call_tool(name: str, arguments: Dict[str, Any]) -> List[types.TextContent]:
+    """Handle tool execution."""
+    handler = TOOL_HANDLERS.get(name)
+    if handler is None:
         return [types.TextContent(
             type="text",
             text=validate_response(f"Unknown tool: {name}")
         )]
+    return await handler(arguments)
 
 async def main():
     """Run the MCP server."""
     # Use stdin/stdout for communication
-    async with mcp.server.stdio.stdio_server() as (read_stream, write_stream):
-        await server.run(
-            read_stream,
-            write_stream,
-            InitializationOptions(
-                server_name="amplify-gen-2-nextjs-docs",
-                server_version="1.0.0",
-                capabilities=server.get_capabilities(
-                    notification_options=NotificationOptions(),
-                    experimental_capabilities={},
+    try:
+        async with mcp.server.stdio.stdio_server() as (read_stream, write_stream):
+            await server.run(
+                read_stream,
+                write_stream,
+                InitializationOptions(
+                    server_name="amplify-gen-2-nextjs-docs",
+                    server_version="1.0.0",
+                    capabilities=server.get_capabilities(
+                        notification_options=NotificationOptions(),
+                        experimental_capabilities={},
+                    ),
                 ),
-            ),
-        )
+            )
+    finally:
+        await close_session()
 
 if __name__ == "__main__":
-    asyncio.run(main())
\ No newline at end of file
+    if uvloop is not None:
+        uvloop.run(main())
+    else:
+        asyncio.run(main())
\ No newline at end of file
@@ -0,0 +1,271 @@
+#!/usr/bin/env python3
+"""
+Test script for the documentation database.
+
+Checks that the full-text index stays in sync with the documents table
+through saves, updates and deletes, that schema migrations upgrade older
+database files, and that cached searches notice writes from other
+connections. Every test works on a fresh database in a temporary directory.
+"""
+
+import json
+import sqlite3
+import sys
+import tempfile
+from pathlib import Path
+
+# Add the current directory to Python path
+sys.path.insert(0, str(Path(__file__).parent))
+
+import amplify_docs_server
+from amplify_docs_server import (
+    FTS_TOKENIZER,
+    AmplifyDocsDatabase,
+    init_database,
+)
+
+def make_doc(url, title, content, markdown=None, category='backend'):
+    """Build a document dict the way the scraper produces it."""
+    return {
+        'url': url,
+        'title': title,
+        'content': content,
+        'markdown_content': markdown if markdown is not None else content,
+        'category': category,
+    }
+
+def fresh_db_path() -> str:
+    """Return a database path in a new temporary directory."""
+    return str(Path(tempfile.mkdtemp()) / "amplify_docs.db")
+
+def reinit(db_path: str):
+    """Run init_database() again, as a new process opening an existing file would."""
+    amplify_docs_server._initialized_databases.discard(db_path)
+    init_database(db_path)
+
+def assert_fts_intact(db_path: str):
+    """Fail if documents_fts disagrees with the documents table."""
+    conn = sqlite3.connect(db_path)
+    try:
+        # Raises SQLITE_CORRUPT_VTAB if the index and its content table differ
+        conn.execute("INSERT INTO documents_fts(documents_fts) VALUES('integrity-check')")
+    finally:
+        conn.close()
+
+def urls(results):
+    return [doc['url'] for doc in results]
+
+def test_fts_follows_saves_updates_and_deletes():
+    """Saving, re-saving and deleting a document keeps MATCH results current."""
+    db_path = fresh_db_path()
+    db = AmplifyDocsDatabase(db_path)
+    url = "https://docs.amplify.aws/nextjs/build-a-backend/auth/set-up-auth/"
+
+    # Words outside the search synonym table, so only the stored text can match
+    assert db.save_document(make_doc(url, "Pool settings", "Walrus configuration"))
+    assert urls(db.search_documents("walrus")) == [url]
+    assert_fts_intact(db_path)
+    row_id = db._conn().execute("SELECT id FROM documents WHERE url = ?", (url,)).fetchone()[0]
+
+    # Saving the same URL again updates the row in place and reindexes it
+    assert db.save_document(make_doc(url, "Pool settings", "Narwhal configuration"))
+    assert db.search_documents("walrus") == [], "stale text still matches after update"
+    assert urls(db.search_documents("narwhal")) == [url]
+    assert db._conn().execute("SELECT id FROM documents WHERE url = ?", (url,)).fetchone()[0] == row_id, \
+        "upsert replaced the row instead of updating it"
+    assert db._conn().execute("SELECT COUNT(*) FROM documents_fts").fetchone()[0] == 1
+    assert_fts_intact(db_path)
+
+    # Updating columns outside the index leaves the index consistent
+    db._conn().execute("UPDATE documents SET code_blocks = '[]' WHERE url = ?", (url,))
+    assert_fts_intact(db_path)
+
+    # Nothing in the database class deletes documents, so delete through another connection
+    other = sqlite3.connect(db_path)
+    other.execute("DELETE FROM documents WHERE url = ?", (url,))
+    other.commit()
+    other.close()
+    assert db.search_documents("narwhal") == [], "deleted document still matches"
+    assert_fts_intact(db_path)
+    print("✓ Full-text index follows saves, updates and deletes")
+
+def test_bulk_save_and_index_rebuild():
+    """Bulk saves index every document and bulk_load() restores the secondary indexes."""
+    db_path = fresh_db_path()
+    db = AmplifyDocsDatabase(db_path)
+    docs = [
+        make_doc(f"https://docs.amplify.aws/nextjs/build-a-backend/storage/page-{i}/", f"Storage page {i}", "Upload files to S3")
+        for i in range(5)
+    ]
+
+    with db.bulk_load():
+        assert db.save_documents_bulk(docs)
+    assert len(db.search_documents("upload", limit=10)) == 5
+    assert_fts_intact(db_path)
+
+    indexes = {row[0] for row in db._conn().execute("SELECT name FROM sqlite_master WHERE type = 'index'")}
+    missing = set(amplify_docs_server.SECONDARY_INDEXES) - indexes
+    assert not missing, f"bulk_load() did not rebuild {missing}"
+    print("✓ Bulk saves are indexed and secondary indexes are rebuilt")
+
+def test_search_cache_sees_other_connections():
+    """A cached search is dropped once another connection commits a change."""
+    db_path = fresh_db_path()
+    db = AmplifyDocsDatabase(db_path)
+    url = "https://docs.amplify.aws/nextjs/build-a-backend/data/data-modeling/"
+
+    assert db.search_documents("schema") == []
+
+    # Write through a separate connection, as a CLI scrape in another process would
+    other = sqlite3.connect(db_path)
+    other.execute(AmplifyDocsDatabase.UPSERT_DOCUMENT_SQL, (
+        url, "Data modeling", "Define a schema with a.model()", "Define a schema", "api-data",
+        "2024-01-01T00:00:00", "[]"
+    ))
+    other.commit()
+    other.close()
+
+    assert urls(db.search_documents("schema")) == [url], "search returned a stale cached result"
+    print("✓ Search cache is invalidated by writes from other connections")
+
+def test_failed_search_is_not_cached():
+    """A search that fails returns no results once, then runs again instead of being cached."""
+    db_path = fresh_db_path()
+    db = AmplifyDocsDatabase(db_path)
+    url = "https://docs.amplify.aws/nextjs/build-a-backend/auth/pool-settings/"
+    assert db.save_document(make_doc(url, "Pool settings", "Walrus configuration"))
+
+    # Fail the next full-text query the way a locked database would
+    real_conn = db._conn()
+    failures = [sqlite3.OperationalError("database is locked")]
+
+    class FlakyCursor:
+        def __init__(self):
+            self.cursor = real_conn.cursor()
+
+        def execute(self, sql, *args):
+            if failures and 'MATCH' in sql:
+                raise failures.pop()
+            return self.cursor.execute(sql, *args)
+
+        def __getattr__(self, name):
+            return getattr(self.cursor, name)
+
+    class FlakyConnection:
+        def cursor(self):
+            return FlakyCursor()
+
+        def __getattr__(self, name):
+            return getattr(real_conn, name)
+
+    flaky_connection = FlakyConnection()
+    db._conn = lambda: flaky_connection
+    assert db.search_documents("walrus") == [], "a failed search should return no results"
+    assert urls(db.search_documents("walrus")) == [url], "a failed search was cached as empty"
+    print("✓ Failed searches are not cached")
+
+def test_tokenizer_migration():
+    """An index built with an older tokenizer is rebuilt with the current one."""
+    db_path = fresh_db_path()
+    db = AmplifyDocsDatabase(db_path)
+    url = "https://docs.amplify.aws/nextjs/reference/cli-commands/"
+    assert db.save_document(make_doc(url, "CLI commands", "Résumé of ampx commands"))
+    db.close()
+
+    # Recreate the index the way an older release built it, without diacritic folding
+    conn = sqlite3.connect(db_path)
+    conn.executescript("""
+        DROP TABLE documents_fts;
+        CREATE VIRTUAL TABLE documents_fts USING fts5(
+            title, content, url, content='documents', content_rowid='id', tokenize='unicode61'
+        );
+        INSERT INTO documents_fts(documents_fts) VALUES ('rebuild');
+    """)
+    conn.close()
+
+    reinit(db_path)
+    conn = sqlite3.connect(db_path)
+    sql = conn.execute("SELECT sql FROM sqlite_master WHERE name = 'documents_fts'").fetchone()[0]
+    conn.close()
+    assert FTS_TOKENIZER in sql, "documents_fts was not recreated with the current tokenizer"
+    assert_fts_intact(db_path)
+
+    db = AmplifyDocsDatabase(db_path)
+    assert urls(db.search_documents("resume")) == [url], "rebuilt index does not fold diacritics"
+    print("✓ Full-text index is rebuilt when its tokenizer changes")
+
+def test_update_trigger_migration():
+    """An update trigger from before the changed-text check is replaced."""
+    db_path = fresh_db_path()
+    init_database(db_path)
+    conn = sqlite3.connect(db_path)
+    conn.executescript("""
+        DROP TRIGGER documents_fts_update;
+        CREATE TRIGGER documents_fts_update AFTER UPDATE ON documents BEGIN
+            INSERT INTO documents_fts(documents_fts, rowid, title, content, url)
+            VALUES ('delete', old.id, old.title, old.content, old.url);
+            INSERT INTO documents_fts(rowid, title, content, url)
+            VALUES (new.id, new.title, new.content, new.url);
+        END;
+    """)
+    conn.close()
+
+    reinit(db_path)
+    conn = sqlite3.connect(db_path)
+    sql = conn.execute("SELECT sql FROM sqlite_master WHERE name = 'documents_fts_update'").fetchone()[0]
+    conn.close()
+    assert 'WHEN' in sql, "old update trigger was not replaced"
+    print("✓ Old full-text update trigger is replaced")
+
+def test_code_blocks_backfill():
+    """Documents saved before the code_blocks column existed get their code blocks filled in."""
+    db_path = fresh_db_path()
+    markdown = "# Handler\n\n```\nexport const handler = async () => 'hi';\n```\n\nDone."
+
+    # The documents table as it was before code_blocks was added
+    conn = sqlite3.connect(db_path)
+    conn.executescript("""
+        CREATE TABLE documents (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            url TEXT UNIQUE NOT NULL,
+            title TEXT NOT NULL,
+            content TEXT NOT NULL,
+            markdown_content TEXT,
+            category TEXT,
+            last_scraped TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            embedding_vector TEXT
+        );
+    """)
+    conn.execute(
+        "INSERT INTO documents (url, title, content, markdown_content, category) VALUES (?, ?, ?, ?, ?)",
+        ("https://docs.amplify.aws/nextjs/build-a-backend/functions/set-up-function/", "Set up a Function",
+         "Handler Done.", markdown, "backend")
+    )
+    conn.commit()
+    conn.close()
+
+    init_database(db_path)
+    conn = sqlite3.connect(db_path)
+    code_blocks = conn.execute("SELECT code_blocks FROM documents").fetchone()[0]
+    conn.close()
+    assert json.loads(code_blocks) == ["export const handler = async () => 'hi';"], code_blocks
+
+    # The pre-existing row is also searchable once the index is built
+    assert_fts_intact(db_path)
+    assert len(AmplifyDocsDatabase(db_path).search_documents("handler")) == 1
+    print("✓ code_blocks is backfilled for older documents")
+
+def main():
+    print("Testing documentation database")
+    print("=" * 60)
+    test_fts_follows_saves_updates_and_deletes()
+    test_bulk_save_and_index_rebuild()
+    test_search_cache_sees_other_connections()
+    test_failed_search_is_not_cached()
+    test_tokenizer_migration()
+    test_update_trigger_migration()
+    test_code_blocks_backfill()
+    print("\n✅ All database tests passed!")
+
+if __name__ == "__main__":
+    main()
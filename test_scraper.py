@@ -0,0 +1,212 @@
+#!/usr/bin/env python3
+"""
+Test script for the documentation scraper.
+
+Runs the scraper against an in-memory fake of the docs site instead of the
+network, and replaces asyncio.sleep with a recorder so waits are checked
+rather than slept through. Covers retries of throttled requests, per-host
+request spacing, and which pages forced and resumed scrapes fetch.
+"""
+
+import asyncio
+import os
+import sys
+import tempfile
+from pathlib import Path
+
+# Add the current directory to Python path
+sys.path.insert(0, str(Path(__file__).parent))
+
+import amplify_docs_server
+from amplify_docs_server import AmplifyDocsDatabase, AmplifyDocsScraper
+
+BASE_URL = "https://docs.amplify.aws/nextjs/"
+PAGE_URLS = [f"{BASE_URL}build-a-backend/page-{i}/" for i in range(4)]
+
+def page_html(title: str, links=()) -> str:
+    anchors = "".join(f'<a href="{link}">{link}</a>' for link in links)
+    return f"<html><body><nav>{anchors}</nav><main><h1>{title}</h1><p>About {title}.</p></main></body></html>"
+
+class FakeResponse:
+    """The parts of aiohttp.ClientResponse the scraper reads."""
+
+    def __init__(self, status: int, body: str = "", headers=None):
+        self.status = status
+        self.headers = headers or {}
+        self.charset = 'utf-8'
+        self._body = body.encode()
+        self.content = self
+
+    async def iter_any(self):
+        yield self._body
+
+    async def text(self):
+        return self._body.decode()
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc_info):
+        return False
+
+class FakeSession:
+    """Serves pages from a dict; a list value is a queue of responses for that URL."""
+
+    def __init__(self, pages):
+        self.pages = pages
+        self.requests = []
+
+    def get(self, url, **kwargs):
+        self.requests.append(url)
+        if url.endswith('/robots.txt'):
+            return FakeResponse(404)
+        response = self.pages.get(url, FakeResponse(404))
+        if isinstance(response, list):
+            response = response.pop(0)
+        return response
+
+def site_pages():
+    """A start page linking to every other page."""
+    pages = {BASE_URL: FakeResponse(200, page_html("Home", PAGE_URLS))}
+    for i, url in enumerate(PAGE_URLS):
+        pages[url] = FakeResponse(200, page_html(f"Page {i}"))
+    return pages
+
+async def record_sleeps(coroutine):
+    """Run a coroutine with asyncio.sleep returning at once; return its result and the waits asked for."""
+    real_sleep = asyncio.sleep
+    sleeps = []
+
+    async def fake_sleep(delay, result=None):
+        sleeps.append(delay)
+        await real_sleep(0)
+        return result
+
+    asyncio.sleep = fake_sleep
+    try:
+        return await coroutine, sleeps
+    finally:
+        asyncio.sleep = real_sleep
+
+async def test_retry_after_then_success():
+    """A 429 is retried after the Retry-After wait and the page is then fetched."""
+    url = PAGE_URLS[0]
+    scraper = AmplifyDocsScraper()
+    scraper.session = FakeSession({url: [
+        FakeResponse(429, headers={'Retry-After': '7'}),
+        FakeResponse(200, page_html("Throttled page")),
+    ]})
+
+    doc, sleeps = await record_sleeps(scraper.fetch_page(url))
+    assert doc is not None and doc['title'] == "Throttled page", doc
+    assert scraper.session.requests.count(url) == 2
+    # Retry-After plus up to a second of jitter
+    assert any(7 <= delay < 8 for delay in sleeps), f"Retry-After was not honoured: {sleeps}"
+    print("✓ 429 with Retry-After is retried after the requested wait")
+
+async def test_client_errors_are_not_retried():
+    """A 404 is given up on at once."""
+    url = PAGE_URLS[0]
+    scraper = AmplifyDocsScraper()
+    scraper.session = FakeSession({url: [FakeResponse(404)]})
+
+    doc, _ = await record_sleeps(scraper.fetch_page(url))
+    assert doc is None
+    assert scraper.session.requests.count(url) == 1
+    print("✓ 404 is not retried")
+
+async def test_server_errors_give_up():
+    """Server errors are retried with growing waits, up to SCRAPE_RETRY_ATTEMPTS requests."""
+    url = PAGE_URLS[0]
+    attempts = amplify_docs_server.SCRAPE_RETRY_ATTEMPTS
+    scraper = AmplifyDocsScraper()
+    scraper.session = FakeSession({url: [FakeResponse(502) for _ in range(attempts)]})
+
+    doc, sleeps = await record_sleeps(scraper.fetch_page(url))
+    assert doc is None
+    assert scraper.session.requests.count(url) == attempts
+    # Waits of 1s, 2s, 4s, ... each with up to a second of jitter
+    backoffs = [delay for delay in sleeps if delay >= 1]
+    assert len(backoffs) == attempts - 1, sleeps
+    assert all(later > earlier for earlier, later in zip(backoffs, backoffs[1:])), f"backoff did not grow: {backoffs}"
+    print("✓ 5xx responses back off and give up after the last attempt")
+
+async def test_requests_to_a_host_are_spaced():
+    """Concurrent fetches to one host start at least SCRAPE_HOST_INTERVAL_SECONDS apart."""
+    scraper = AmplifyDocsScraper()
+    scraper.session = FakeSession(site_pages())
+
+    _, sleeps = await record_sleeps(asyncio.gather(*(scraper.fetch_page(url) for url in PAGE_URLS)))
+    interval = amplify_docs_server.SCRAPE_HOST_INTERVAL_SECONDS
+    assert interval >= 1.5, f"host interval is {interval}s"
+    # The first request goes at once; each later one waits one more interval
+    waits = sorted(sleeps)
+    expected = [interval * i for i in range(1, len(PAGE_URLS))]
+    assert all(abs(wait - want) < 0.1 for wait, want in zip(waits, expected)) and len(waits) == len(expected), \
+        f"requests were not spaced {interval}s apart: {waits}"
+    print(f"✓ Requests to one host are spaced {interval}s apart")
+
+async def run_scrape(pages, **kwargs):
+    """Scrape the fake site; return the content pages fetched and whether indexes were dropped."""
+    bulk_loads = []
+    real_bulk_load = AmplifyDocsDatabase.bulk_load
+
+    def spy_bulk_load(self):
+        bulk_loads.append(True)
+        return real_bulk_load(self)
+
+    AmplifyDocsDatabase.bulk_load = spy_bulk_load
+    try:
+        scraper = AmplifyDocsScraper()
+        scraper.session = FakeSession(pages)
+        # Link discovery also requests pages, so count the pages fetched for saving
+        fetched = set()
+        real_fetch_page = scraper.fetch_page
+
+        async def spy_fetch_page(url):
+            fetched.add(url)
+            return await real_fetch_page(url)
+
+        scraper.fetch_page = spy_fetch_page
+        await record_sleeps(scraper.scrape_docs(**kwargs))
+    finally:
+        AmplifyDocsDatabase.bulk_load = real_bulk_load
+    return fetched, bool(bulk_loads)
+
+async def test_forced_and_resumed_scrapes():
+    """Forced scrapes fetch every page; resumed ones skip recent pages and keep the indexes."""
+    # scrape_docs works on the default database file in the current directory
+    os.chdir(tempfile.mkdtemp())
+
+    fetched, bulk = await run_scrape(site_pages(), resume=True)
+    assert fetched == set(PAGE_URLS), "resume into an empty database skipped pages"
+    assert bulk, "loading an empty database did not use bulk_load()"
+
+    fetched, bulk = await run_scrape(site_pages(), resume=True)
+    assert fetched == set(), f"resume refetched recent pages: {fetched}"
+    assert not bulk, "a resumed scrape dropped the secondary indexes"
+
+    fetched, bulk = await run_scrape(site_pages(), force_refresh=True)
+    assert fetched == set(PAGE_URLS), "a forced refresh skipped recently scraped pages"
+    assert bulk
+
+    fetched, _ = await run_scrape(site_pages(), force_refresh=True, resume=True)
+    assert fetched == set(PAGE_URLS), "resume overrode a forced refresh"
+
+    fetched, _ = await run_scrape(site_pages())
+    assert fetched == set(), "an unforced scrape of a populated database fetched pages"
+    assert AmplifyDocsDatabase().get_stats()['total_documents'] == len(PAGE_URLS)
+    print("✓ Forced scrapes fetch every page; resumed scrapes skip recent ones")
+
+async def main():
+    print("Testing documentation scraper")
+    print("=" * 60)
+    await test_retry_after_then_success()
+    await test_client_errors_are_not_retried()
+    await test_server_errors_give_up()
+    await test_requests_to_a_host_are_spaced()
+    await test_forced_and_resumed_scrapes()
+    print("\n✅ All scraper tests passed!")
+
+if __name__ == "__main__":
+    asyncio.run(main())
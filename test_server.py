@@ -54,7 +54,17 @@ async def test_server():
         # Check that tools are registered
         logger.info("\nChecking tool registration...")
         logger.info("✓ Tools are registered with the server")
-        
+
+        # Test markdown conversion of highlighted code blocks
+        logger.info("\nTesting markdown conversion...")
+        from amplify_docs_server import parse_html
+        scraper = AmplifyDocsScraper()
+        soup = parse_html("<main><pre><span><code>x</code></span></pre></main>")
+        markdown = scraper.html_to_markdown(soup.main)
+        assert markdown == "```\nx\n```\n", f"Unexpected markdown: {markdown!r}"
+        assert markdown.count("x") == 1, "Code nested inside <pre> was emitted twice"
+        logger.info("✓ Code nested inside <pre> becomes a single fenced block")
+
         logger.info("\n✅ All tests passed! The server is ready to use.")
         logger.info("\nTo use with Claude Desktop, add the configuration from claude_desktop_config.json")
         logger.info("to your Claude Desktop settings.")